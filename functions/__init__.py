@@ -2,14 +2,18 @@
 Functions
 """
 from math_utils.functions._catalan import *
+from math_utils.functions._divisors import *
 from math_utils.functions._faulhaber import *
 from math_utils.functions._main import *
 from math_utils.functions._mobius import *
+from math_utils.functions._multiplicative import *
 from math_utils.functions._other import *
 from math_utils.functions._primes import *
 from math_utils.functions._root import *
+from math_utils.functions._sieve import *
 from math_utils.functions._sign import *
 from math_utils.functions._stirling import *
 from math_utils.functions._sums import *
+from math_utils.functions._transforms import *
 
 # TODO: bell, euler, harmonic, genocchi, (fibonacci, tribonacci, n-bonacci, lucas, padovan, etc)
@@ -1,27 +1,106 @@
 """
 Bernoulli Function
+
+B_n (n >= 2 even) is computed directly from |B_n| = 2 n! ζ(n) / (2π)^n:
+the von Staudt-Clausen theorem gives the denominator D = Π_{(p-1) | n} p, so only the integer |B_n| D
+has to be recovered, which needs π and ζ(n) (Euler product) to about log2(|B_n| D) bits of fixed-point precision.
 """
 from fractions import Fraction
 from itertools import count
+from math import factorial, isqrt, lgamma, log, log2, pi
 from typing import SupportsInt
 
-__all__ = ['bernoulli', 'bernoulli2']
+# LOCAL #
+from math_utils.functions._primes import is_prime
+from math_utils.functions._sieve import iter_primes
+
+__all__ = ['bernoulli', 'bernoulli2', 'bernoulli_table']
+
+_cache: dict[int, Fraction] = {0: Fraction(1), 1: Fraction(1, 2)}  # B_1 = +1/2
+_pi: tuple[int, int] = (0, 0)  # (bits, floor(π 2^bits))
+
+
+def _pi_fixed(bits: int) -> int:
+    """ :returns: π 2^bits (Chudnovsky series with binary splitting), cached at the highest precision seen """
+    global _pi
+    if bits <= _pi[0]:
+        return _pi[1] >> _pi[0] - bits
+
+    c = 640320 ** 3 // 24
+
+    def split(a: int, b: int) -> tuple[int, int, int]:
+        if b - a == 1:
+            p, q = (1, 1) if a == 0 else ((6 * a - 5) * (2 * a - 1) * (6 * a - 1), a * a * a * c)
+            t = p * (13591409 + 545140134 * a)
+            return p, q, -t if a % 2 else t
+        m = (a + b) // 2
+        p1, q1, t1 = split(a, m)
+        p2, q2, t2 = split(m, b)
+        return p1 * p2, q1 * q2, q2 * t1 + p1 * t2
+
+    guard = bits + 16
+    _, q, t = split(0, guard // 47 + 2)  # ~47 bits per term
+    _pi = guard, q * 426880 * isqrt(10005 << 2 * guard) // t
+    return _pi[1] >> 16
+
+
+def _bernoulli_zeta(n: int) -> Fraction:
+    """ B_n for even n >= 2 """
+    d = 1  # von Staudt-Clausen denominator
+    for k in range(1, isqrt(n) + 1):
+        if not n % k:
+            for j in {k, n // k}:
+                if is_prime(j + 1): d *= j + 1
+
+    size = (lgamma(n + 1) - n * log(2 * pi)) / log(2) + log2(d) + 2  # bits of |B_n| d
+    w = max(0, int(size)) + n.bit_length() + 32
+    one = 1 << w
+
+    z = one  # ζ(n) 2^w
+    for p in iter_primes(2, int(2 ** (w / n)) + 2):
+        z += z * (one // (p ** n - 1)) >> w  # z / (1 - p^-n) = z + z / (p^n - 1)
+
+    x, base, e = one, 2 * _pi_fixed(w + n.bit_length()) >> n.bit_length(), n  # (2π)^n 2^w
+    while e:
+        if e & 1: x = x * base >> w
+        base = base * base >> w
+        e >>= 1
+
+    numerator = (4 * factorial(n) * d * z + x) // (2 * x)
+    return Fraction(numerator if n % 4 == 2 else -numerator, d)
 
 
 def bernoulli(__x: SupportsInt) -> Fraction:
+    """
+    Bernoulli Number B_x (B_1 = +1/2), cached process-wide
+
+    >>> bernoulli(12)
+    Fraction(-691, 2730)
+    >>> bernoulli(60).denominator
+    56786730
+    """
     x = int(__x)
-    A: list[int | Fraction] = [0] * (x + 1)
-    for m in range(x + 1):
-        A[m] = Fraction(1, m + 1)
-        for j in range(m, 0, -1):
-            A[j - 1] = j * (A[j - 1] - A[j])
-    return A[0]
+    if x < 0: raise ValueError('math domain error')
+    if x not in _cache:
+        _cache[x] = Fraction(0) if x % 2 else _bernoulli_zeta(x)
+    return _cache[x]
 
 
 def bernoulli2():
-    A = []
-    for m in count():
-        A.append(Fraction(1, m + 1))
-        for j in range(m, 0, -1):
-            A[j - 1] = j * (A[j - 1] - A[j])
-        yield A[0]
+    yield from map(bernoulli, count())
+
+
+def bernoulli_table(n: int, /) -> list[Fraction]:
+    """
+    Bernoulli Numbers B_0..B_n from the process-wide cache
+
+    >>> [str(b) for b in bernoulli_table(8)]
+    ['1', '1/2', '1/6', '0', '-1/30', '0', '1/42', '0', '-1/30']
+    """
+    return [bernoulli(m) for m in range(n + 1)]
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
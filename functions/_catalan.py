@@ -1,10 +1,39 @@
 """
 Catalan
 """
-from itertools import pairwise
+from collections.abc import Generator
+from itertools import accumulate, count, islice, pairwise
 from math import comb
 
-__all__ = ['catalan', 'catalan2', 'sequence', 'super_trapezoid', 'super_triangle', 'trapezoid', 'triangle']
+# LOCAL #
+from math_utils.functions._poly import factorial_table
+from math_utils.functions._primes import decomposition
+from math_utils.functions._sieve import iter_primes
+
+__all__ = [
+    'catalan', 'catalan2', 'catalan3', 'catalan_mod', 'sequence', 'super_trapezoid', 'super_trapezoid_rows',
+    'super_triangle', 'trapezoid', 'trapezoid_rows', 'triangle',
+]
+
+TABLE_CAP = 1 << 20  # largest factorial table built (and cached) for a prime power of the modulus
+
+_p_free_factorials: dict[int, list[int]] = {}  # p^e -> [Π_{j <= i, p ∤ j} j mod p^e], for p^e <= TABLE_CAP
+
+
+def _legendre(n: int, p: int) -> int:
+    """ :returns: exponent of p in n! """
+    res = 0
+    while n:
+        n //= p
+        res += n
+    return res
+
+
+def _balanced_prod(xs: list[int]) -> int:
+    """ product with operands of similar size (pairwise tree), so that big multiplications stay balanced """
+    while len(xs) > 1:
+        xs = [xs[i] * xs[i + 1] for i in range(0, len(xs) - 1, 2)] + xs[len(xs) - 1:] * (len(xs) % 2)
+    return xs[0] if xs else 1
 
 
 def catalan(n: int):  # A000108
@@ -20,32 +49,116 @@ def catalan(n: int):  # A000108
     [1, 1, 2, 5, 14, 42, 132, 429, 1430, 4862]
     >>> catalan(20)
     6564120420
+    >>> catalan(1000) == comb(2000, 1000) // 1001
+    True
     """
-    return comb(2 * n, n) // (n + 1)  # (2n)!/(n!(n+1)!)
+    if n < 500:
+        return comb(2 * n, n) // (n + 1)  # (2n)!/(n!(n+1)!)
+    # exponent of every prime p <= 2n by Legendre's formula, multiplied out as a balanced product tree
+    factors = []
+    for p in iter_primes(2, 2 * n + 1):
+        e = _legendre(2 * n, p) - _legendre(n, p) - _legendre(n + 1, p)
+        if e: factors.append(p ** e)
+    return _balanced_prod(factors)
+
+
+def _p_free_factorial(n: int, p: int, pe: int) -> int:
+    """ :returns: n! with all factors p removed, modulo p^e """
+    size = min(n, pe - 1)
+    if pe <= TABLE_CAP:
+        table = _p_free_factorials.setdefault(pe, [1])
+    elif size <= TABLE_CAP:
+        table = [1]
+    else:
+        raise ValueError(f'the prime power {pe} of the modulus needs a table of {size + 1} entries (TABLE_CAP)')
+    for i in range(len(table), size + 1):
+        table.append(table[-1] * (i if i % p else 1) % pe)
+    block = 1 if p == 2 and pe > 4 else pe - 1  # Π_{j < p^e, p ∤ j} j ≡ ±1 (generalized Wilson)
+    res = 1
+    while n:
+        if (n // pe) % 2 and block != 1: res = pe - res
+        res = res * table[n % pe] % pe
+        n //= p
+    return res
 
 
-def sequence(n: int) -> list[int]:  # A000108
+def _lucas(n: int, k: int, p: int) -> int:
+    """ :returns: C(n, k) mod prime p, digit by digit in base p (Lucas' theorem) """
+    fact, inv = factorial_table(p - 1, p) if p <= TABLE_CAP else (None, None)
+    res = 1
+    while k and res:
+        a, b = n % p, k % p
+        if b > a: return 0
+        if fact is not None:
+            res = res * fact[a] * inv[b] * inv[a - b] % p
+        else:  # running product of C(a, b) = Π (a - i) / (i + 1), i < min(b, a - b)
+            num, den = 1, 1
+            for i in range(min(b, a - b)):
+                num = num * (a - i) % p
+                den = den * (i + 1) % p
+            res = res * num * pow(den, -1, p) % p
+        n //= p
+        k //= p
+    return res
+
+
+def _binom_mod_prime_power(n: int, k: int, p: int, e: int) -> int:
+    """ :returns: C(n, k) mod p^e (Granville's generalization of Lucas' theorem) """
+    if k < 0 or k > n: return 0
+    if e == 1: return _lucas(n, k, p)
+    pe = p ** e
+    v = _legendre(n, p) - _legendre(k, p) - _legendre(n - k, p)
+    if v >= e: return 0
+    denominator = _p_free_factorial(k, p, pe) * _p_free_factorial(n - k, p, pe)
+    return _p_free_factorial(n, p, pe) * pow(denominator, -1, pe) * p ** v % pe
+
+
+def catalan_mod(n: int, m: int) -> int:
+    """
+    Catalan Numbers Modulo m
+
+    C(n) = C(2n, n) - C(2n, n + 1) modulo every prime power p^e of m, combined by the Chinese remainder theorem;
+    primes go digit by digit (Lucas), higher prime powers need a table of min(p^e, 2n + 1) entries,
+    so a ValueError is raised when that exceeds TABLE_CAP
+
+    >>> catalan_mod(20, 1000), catalan(20) % 1000
+    (420, 420)
+    >>> catalan_mod(10 ** 12, 999983)
+    92662
+    >>> p = 10 ** 9 + 7
+    >>> catalan_mod(400 * p + 1000, p) == comb(800, 400) * catalan(1000) % p  # Lucas: digits (1000, 400)
+    True
+    >>> catalan_mod(10 ** 12, 3 << 30)
+    Traceback (most recent call last):
+    ...
+    ValueError: the prime power 1073741824 of the modulus needs a table of 1073741824 entries (TABLE_CAP)
+    """
+    if m < 1: raise ValueError('m must be >= 1')
+    res, mod = 0, 1
+    for p, e in decomposition(m).items():
+        pe = p ** e
+        r = (_binom_mod_prime_power(2 * n, n, p, e) - _binom_mod_prime_power(2 * n, n + 1, p, e)) % pe
+        res += mod * ((r - res) * pow(mod, -1, pe) % pe)
+        mod *= pe
+    return res % m
+
+
+def sequence(n: int) -> Generator[int, None, None]:  # A000108
     """
     Catalan Sequence
 
+    C(k + 1) = C(k) 2(2k + 1) / (k + 2)
+
     :param n: length
-    :returns: linear array
+    :returns: the first n Catalan numbers
 
-    >>> sequence(10)
+    >>> list(sequence(10))
     [1, 1, 2, 5, 14, 42, 132, 429, 1430, 4862]
     """
-    DP = [0] * (n + 1)
-    DP[1] = flag = h = 1
-    res = []
-    for i in range(2 * n - 1):
-        if flag:
-            for k in range(h, 0, -1): DP[k] += DP[k - 1]
-            h += 1
-            res.append(DP[1])
-        else:
-            for k in range(1, h, +1): DP[k] += DP[k + 1]
-        flag ^= 1
-    return res
+    c = 1
+    for k in range(n):
+        yield c
+        c = c * 2 * (2 * k + 1) // (k + 2)
 
 
 def catalan2(n: int, k: int) -> int:  # A009766
@@ -86,7 +199,7 @@ def triangle(n: int) -> list[list[int]]:  # A009766
     return trapezoid(1, n)
 
 
-def catalan3(m: int, n: int, k: int) -> int:
+def catalan3(m: int, n: int, k: int, mod: int | None = None) -> int:
     """
     Catalan's Trapezoid Numbers
 
@@ -115,9 +228,27 @@ def catalan3(m: int, n: int, k: int) -> int:
      [1, 3, 6, 9, 9],
      [1, 4, 10, 19, 28],
      [1, 5, 15, 34, 62]]
+    >>> catalan3(3, 10, 7), catalan3(3, 10, 7, mod=13), catalan3(3, 10, 7, mod=10 ** 9 + 7)
+    (17068, 12, 17068)
     """
+    if mod is not None:
+        fact, inv = factorial_table(n + k, mod)
+        if fact is not None:
+            def binom(a: int, b: int) -> int:
+                return fact[a] * inv[b] * inv[a - b] % mod if 0 <= b <= a else 0
+
+            if 0 <= k < m:          return binom(n + k, k)
+            if m <= k <= n + m - 1: return (binom(n + k, k) - binom(n + k, k - m)) % mod
+            return 0
+        return catalan3(m, n, k) % mod
+
     if 0 <= k < m:          return comb(n + k, k)
-    if m <= k <= n + m - 1: return comb(n + k, k) - comb(n + k, k - m)
+    if m <= k <= n + m - 1:  # C(n+k, k-m) = C(n+k, k) Π_{i<m} (k-i) / Π_{i<m} (n+m-i)
+        above, below = 1, 1
+        for i in range(m):
+            above *= k - i
+            below *= n + m - i
+        return comb(n + k, k) * (below - above) // below
     return 0
 
 
@@ -148,16 +279,58 @@ def trapezoid(m: int, n: int) -> list[list[int]]:
      [1, 5, 15, 34, 62, 90, 90],
      [1, 6, 21, 55, 117, 207, 297, 297]]
     """
-    if n < 1: return []
-    res = [[1] * m]
-    for _ in range(n - 1):
-        row = [1]
-        for above in res[-1][1:]:
-            left = row[-1]
-            row.append(above + left)
+    return list(trapezoid_rows(m, n))
+
+
+def trapezoid_rows(m: int, n: int | None = None, *, mod: int | None = None,
+                   as_numpy: bool = False) -> Generator:
+    """
+    Catalan's Trapezoid, streamed row by row (only the previous row is kept)
+
+    each row is the running sum of the row above (without its first entry), starting at 1, plus a repeated last entry
+
+    :param m: order (= number of starting columns)
+    :param n: number of rows (None for endless)
+    :param mod: reduce the entries modulo mod
+    :param as_numpy: yield NumPy arrays (int64 with a modulus below 2^31, object otherwise)
+
+    >>> list(trapezoid_rows(2, 4))
+    [[1, 1], [1, 2, 2], [1, 3, 5, 5], [1, 4, 9, 14, 14]]
+    >>> list(trapezoid_rows(1, 7, mod=10))[-1]
+    [1, 6, 0, 8, 0, 2, 2]
+    >>> next(islice(trapezoid_rows(1, as_numpy=True, mod=7), 6, None))
+    array([1, 6, 6, 6, 6, 6, 6])
+    >>> list(trapezoid_rows(2, 2, mod=1)), [row.tolist() for row in trapezoid_rows(2, 2, mod=1, as_numpy=True)]
+    ([[0, 0], [0, 0, 0]], [[0, 0], [0, 0, 0]])
+    """
+    return _rows(m, n, mod, as_numpy, superior=False)
+
+
+def _rows(m: int, n: int | None, mod: int | None, as_numpy: bool, superior: bool) -> Generator:
+    """ rows of (super-)Catalan trapezoids """
+    if as_numpy:
+        import numpy as np
+
+        dtype = np.int64 if mod is not None and mod < 1 << 31 else object
+        row = np.full(m, 1 if mod is None else 1 % mod, dtype=dtype)
+        for _ in range(n) if n is not None else count():
+            yield row
+            new = np.empty(len(row) + 1, dtype=dtype)
+            new[0] = 1
+            steps = row[:-1] + row[1:] if superior else row[1:]
+            new[1:-1] = np.cumsum(steps) + 1
+            new[-1] = new[-2]
+            if mod is not None: new %= mod
+            row = new
+        return
+
+    row = [1 if mod is None else 1 % mod] * m
+    for _ in range(n) if n is not None else count():
+        yield row
+        steps = map(sum, pairwise(row)) if superior else islice(row, 1, None)
+        row = list(accumulate(steps, initial=1))
+        if mod is not None: row = [x % mod for x in row]
         row.append(row[-1])
-        res.append(row)
-    return res
 
 
 def super_triangle(n: int) -> list[list[int]]:  # A144944
@@ -210,16 +383,25 @@ def super_trapezoid(m: int, n: int) -> list[list[int]]:
      [1, 9, 41, 127, 295, 509, 509],
      [1, 11, 61, 229, 651, 1455, 2473, 2473]]
     """
-    if n < 1: return []
-    res = [[1] * m]
-    for _ in range(n - 1):
-        row = [1]
-        for above_left, above in pairwise(res[-1]):
-            left = row[-1]
-            row.append(above_left + above + left)
-        row.append(row[-1])
-        res.append(row)
-    return res
+    return list(super_trapezoid_rows(m, n))
+
+
+def super_trapezoid_rows(m: int, n: int | None = None, *, mod: int | None = None,
+                         as_numpy: bool = False) -> Generator:
+    """
+    Super-Catalan's Trapezoid, streamed row by row (only the previous row is kept)
+
+    :param m: order (= number of starting columns)
+    :param n: number of rows (None for endless)
+    :param mod: reduce the entries modulo mod
+    :param as_numpy: yield NumPy arrays (int64 with a modulus below 2^31, object otherwise)
+
+    >>> list(super_trapezoid_rows(1, 4))
+    [[1], [1, 1], [1, 3, 3], [1, 5, 11, 11]]
+    >>> list(super_trapezoid_rows(3, 6, mod=100))[-1]
+    [1, 11, 61, 29, 51, 55, 73, 73]
+    """
+    return _rows(m, n, mod, as_numpy, superior=True)
 
 
 # TODO:
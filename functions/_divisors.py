@@ -0,0 +1,195 @@
+"""
+Divisors
+
+Everything here works from the prime factorization {p: e} (as returned by `decomposition`),
+which may be passed in directly instead of n to skip the factoring step.
+`divisor_lists` instead sieves the divisors of every n <= N at once into a compressed sparse row layout.
+"""
+import os
+from array import array
+from collections.abc import Generator, Mapping
+from heapq import heappop, heappush
+from math import isqrt, prod
+from mmap import ACCESS_READ, mmap
+from tempfile import NamedTemporaryFile
+
+# LOCAL #
+from math_utils.functions._primes import decomposition
+
+__all__ = ['DivisorLists', 'divisor_count', 'divisor_lists', 'divisor_sum', 'divisors_sorted', 'divisors_upto']
+
+Factorization = Mapping[int, int]
+
+
+def _factors(n: int | Factorization) -> list[tuple[int, int]]:
+    """ (p, e) pairs of n in increasing order of p """
+    if isinstance(n, int):
+        if n < 1: raise ValueError('n must be >= 1')
+        n = decomposition(n)
+    return sorted(n.items())
+
+
+def iter_divisors(n: int | Factorization, /) -> Generator[int, None, None]:
+    """ all divisors, in no particular order (the product expansion of the prime powers) """
+    res = [1]
+    for p, e in _factors(n):
+        res = [d * q for q in [p ** i for i in range(e + 1)] for d in res]
+    yield from res
+
+
+def divisors_sorted(n: int | Factorization, /) -> Generator[int, None, None]:
+    """
+    Divisors In Increasing Order, streamed from a heap
+
+    every divisor d > 1 is pushed exactly once, by d / P(d) where P(d) is its largest prime factor,
+    so stopping early costs only the divisors seen so far (plus the heap of pending candidates)
+
+    >>> list(divisors_sorted(360))[:12]
+    [1, 2, 3, 4, 5, 6, 8, 9, 10, 12, 15, 18]
+    >>> next(d for d in divisors_sorted({2: 40, 3: 40}) if d > 10 ** 20)
+    101085468550861160448
+    """
+    fs = _factors(n)
+    heap = [(1, -1, 0)]  # (divisor, index of its largest prime, exponent of that prime)
+    while heap:
+        d, i, e = heappop(heap)
+        yield d
+        if i >= 0 and e < fs[i][1]: heappush(heap, (d * fs[i][0], i, e + 1))
+        for j in range(i + 1, len(fs)):
+            heappush(heap, (d * fs[j][0], j, 1))
+
+
+def divisors_upto(n: int | Factorization, bound: int, /) -> Generator[int, None, None]:
+    """
+    Divisors <= bound (depth-first over the prime powers, pruned as soon as a product exceeds the bound)
+
+    >>> sorted(divisors_upto(720720, 20))
+    [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 18, 20]
+    """
+    fs = _factors(n)
+    if bound < 1: return
+    stack = [(1, 0)]  # (divisor, index of the next prime to multiply in)
+    while stack:
+        d, i = stack.pop()
+        yield d
+        for j in range(i, len(fs)):
+            p, e = fs[j]
+            if d * p > bound: break  # the primes are increasing
+            x = d
+            for _ in range(e):
+                x *= p
+                if x > bound: break
+                stack.append((x, j + 1))
+
+
+def divisor_count(n: int | Factorization, /) -> int:
+    """
+    Number Of Divisors τ(n) = Π (e + 1)
+
+    >>> divisor_count(360), divisor_count({2: 100, 3: 100})
+    (24, 10201)
+    """
+    return prod(e + 1 for _, e in _factors(n))
+
+
+def divisor_sum(n: int | Factorization, /, k: int = 1) -> int:
+    """
+    Sum Of The k-th Powers Of The Divisors σ_k(n) = Π (p^(k(e+1)) - 1) / (p^k - 1)
+
+    >>> divisor_sum(360), divisor_sum(360, 2), divisor_sum(360, 0)
+    (1170, 201110, 24)
+    """
+    if k == 0: return divisor_count(n)
+    return prod((p ** (k * (e + 1)) - 1) // (p ** k - 1) for p, e in _factors(n))
+
+
+class DivisorLists:
+    """ divisors of every n <= limit, in increasing order: values[offsets[n]:offsets[n + 1]] """
+
+    def __init__(self, values: memoryview, offsets: memoryview, /) -> None:
+        self.values = values
+        self.offsets = offsets
+
+    @property
+    def limit(self) -> int:
+        return len(self.offsets) - 2
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, n: int, /) -> memoryview:
+        """ :returns: the divisors of n as a read-only view (no copy) """
+        if not 0 <= n <= self.limit: raise IndexError('n out of range')
+        return self.values[self.offsets[n]:self.offsets[n + 1]]
+
+    def count(self, n: int, /) -> int:
+        """ :returns: number of divisors of n """
+        return self.offsets[n + 1] - self.offsets[n]
+
+
+def divisor_lists(limit: int, /, path: str | os.PathLike | None = None) -> DivisorLists:
+    """
+    Divisor Lists Of All n <= limit, in one flat uint32 array indexed by a uint64 offsets array
+
+    for every d <= sqrt(limit) the multiples m = d q (q >= d) get d from the front and q from the back of their row,
+    so each row comes out sorted after O(limit log limit) vectorized writes
+
+    :param path: optional raw file (header: limit as uint64, then the offsets, then the values);
+                 it is memory-mapped if it covers limit, and (re)written otherwise
+
+    >>> table = divisor_lists(100)
+    >>> table[60].tolist(), table.count(97), table[1].tolist()
+    ([1, 2, 3, 4, 5, 6, 10, 12, 15, 20, 30, 60], 2, [1])
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'divisors.bin')
+    >>> small = divisor_lists(150, path)
+    >>> [divisor_lists(m, path).limit for m in (100, 5000, 300)], small[12].tolist()
+    ([100, 5000, 300], [1, 2, 3, 4, 6, 12])
+    """
+    if path is not None and os.path.exists(path):
+        with open(path, 'rb') as file:
+            mm = mmap(file.fileno(), 0, access=ACCESS_READ)
+        n = array('Q', mm[:8])[0]
+        if n >= limit:  # a larger stored table serves any smaller limit, a smaller one is rebuilt below
+            view = memoryview(mm)
+            mid = 8 * (n + 3)
+            offsets = view[8:mid].cast('Q')[:limit + 2]
+            return DivisorLists(view[mid:].cast('I')[:offsets[-1]], offsets)
+        mm.close()
+
+    import numpy as np
+
+    if not 0 <= limit < 1 << 32: raise ValueError('limit must be in [0, 2^32)')
+    root = isqrt(limit)
+    counts = np.zeros(limit + 2, dtype=np.uint64)  # counts[m + 1] = number of divisors of m
+    for d in range(1, root + 1):
+        counts[d * d + 1::d] += 2
+        counts[d * d + 1] -= 1
+    offsets = array('Q', bytes(8 * (limit + 2)))
+    np.cumsum(counts, out=np.frombuffer(offsets, dtype=np.uint64))
+
+    values = array('I', bytes(4 * offsets[-1]))
+    flat = np.frombuffer(values, dtype=np.uint32)
+    front = np.frombuffer(offsets, dtype=np.uint64)[:-1].copy()  # next free slot from the left
+    back = np.frombuffer(offsets, dtype=np.uint64)[1:] - np.uint64(1)  # and from the right
+    for d in range(1, root + 1):
+        ms = np.arange(d * d, limit + 1, d)
+        flat[front[ms]] = d
+        front[ms] += np.uint64(1)
+        ms = ms[1:]  # q > d
+        flat[back[ms]] = ms // d
+        back[ms] -= np.uint64(1)
+
+    if path is not None:  # written aside and swapped in, so tables already mapped from path stay intact
+        with NamedTemporaryFile('wb', dir=os.path.dirname(os.path.abspath(path)), delete=False) as file:
+            array('Q', [limit]).tofile(file)
+            offsets.tofile(file)
+            values.tofile(file)
+        os.replace(file.name, path)
+    return DivisorLists(memoryview(values).toreadonly(), memoryview(offsets).toreadonly())
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
@@ -1,68 +1,103 @@
 """
 Faulhaber's Function
 
-:IMPLEMENTATION:
+S_p(k) = 1^p + 2^p + ... + k^p = 1/(p+1) Σ_{j=0}^{p} C(p+1, j) B_j k^(p+1-j)   (B_1 = +1/2)
 
-from math import comb
-from ._bernoulli import bernoulli2
-
-def faulhaber(exp: SupportsInt, num: SupportsInt) -> int:
-    n, k = int(exp), int(num)
-    s = 0
-    for j, a in enumerate(bernoulli2()):
-        if j > k: break
-        s = s + comb(k + 1, j) * a * n ** (k + 1 - j)
-    return s // (k + 1)
-
-IT'S MORE EFFICIENT TO USE 'sum(i ** exp for i in range(1, num))' IN THIS CASE
+The coefficients are cached per exponent as integer numerators over a common denominator,
+so an evaluation is one integer Horner pass and a single division.
+For huge k modulo m, `power_sum_mod` avoids Fractions altogether.
 """
 from collections.abc import Callable
 from fractions import Fraction
+from functools import cache
+from math import comb, lcm
 from typing import SupportsInt
 
-__all__ = ['faulhaber']
-
-
-def next_u(__u: list[int]) -> list[int]:
-    n = len(__u)
-    __u.append(1)
-    for i in range(n - 1, 0, -1):
-        __u[i] = i * __u[i] + __u[i - 1]
-    return __u
-
+# LOCAL #
+from math_utils.functions._bernoulli import bernoulli
+from math_utils.functions._primes import is_prime
 
-def next_v(__v: list[int]) -> list[int]:
-    n = len(__v) - 1
-    v = [i * (1 - n) for i in __v]
-    v.append(1)
-    for i in range(n):
-        v[i + 1] += __v[i]
-    return v
+__all__ = ['faulhaber', 'power_sum_mod']
 
 
-def coefficients(n: int) -> list[Fraction]:
-    if n == 0: return [Fraction(), Fraction(1)]
-
-    u = [0, 1]
-    v = [[1], [1, 1]]
-
-    for _ in range(n - 1):  # TODO : optimize, -bernoulli-, STERLING?
-        v.append(next_v(v[-1]))
-        u = next_u(u)
+@cache
+def coefficients(n: int) -> tuple[Fraction, ...]:
+    """ :returns: coefficients of S_n(k), lowest degree first """
+    coeffs = [Fraction()] * (n + 2)
+    for j in range(n + 1):
+        coeffs[n + 1 - j] = comb(n + 1, j) * bernoulli(j) / (n + 1)
+    return tuple(coeffs)
 
-    v.append(next_v(v[-1]))
 
-    coeffs = [Fraction()] * (n + 2)
-    for j, a in enumerate(u):
-        a = Fraction(a, j + 1)
-        for k, b in enumerate(v[j + 1]):
-            coeffs[k] += a * b
-    return coeffs
+@cache
+def integer_coefficients(n: int) -> tuple[tuple[int, ...], int]:
+    """ :returns: numerators of the coefficients of S_n(k) (lowest degree first) and their common denominator """
+    coeffs = coefficients(n)
+    d = lcm(*(c.denominator for c in coeffs))
+    return tuple(c.numerator * (d // c.denominator) for c in coeffs), d
 
 
 def faulhaber(exp: SupportsInt) -> Callable[[int], Fraction]:  # Fractions to increase accuracy
-    coeffs = coefficients(int(exp))
-    return lambda k: sum(coeff * k ** j for j, coeff in enumerate(coeffs) if coeff)
+    """
+    >>> faulhaber(2)(3)
+    Fraction(14, 1)
+    >>> faulhaber(10)(1000) == sum(i ** 10 for i in range(1, 1001))
+    True
+    """
+    numerators, d = integer_coefficients(int(exp))
+
+    def _faulhaber(k: int) -> Fraction:
+        res = 0
+        for c in reversed(numerators):
+            res = res * k + c
+        return Fraction(res, d)
+
+    return _faulhaber
+
+
+def power_sum_mod(exp: int, n: int, m: int) -> int:
+    """
+    Power Sum Modulo m: (1^exp + 2^exp + ... + n^exp) mod m
+
+    for a prime m > exp + 1 the degree exp + 1 polynomial is interpolated (Lagrange) from its values at 0..exp+1,
+    otherwise the integer Faulhaber coefficients are evaluated modulo m * denominator
+
+    >>> n = 10 ** 18
+    >>> power_sum_mod(2, n, 10 ** 9 + 7) == n * (n + 1) * (2 * n + 1) // 6 % (10 ** 9 + 7)
+    True
+    >>> power_sum_mod(3, n, 10 ** 9) == (n * (n + 1) // 2) ** 2 % 10 ** 9
+    True
+    """
+    if m == 1 or n <= 0: return 0
+    d = exp + 1  # degree
+    if n <= d:
+        return sum(pow(i, exp, m) for i in range(1, n + 1)) % m
+
+    if m > d and is_prime(m):
+        ys = [0]
+        for i in range(1, d + 1):
+            ys.append((ys[-1] + pow(i, exp, m)) % m)
+        prefix = [1] * (d + 2)  # prefix[i] = Π_{j<i} (n - j)
+        suffix = [1] * (d + 2)  # suffix[i] = Π_{j>=i} (n - j)
+        for i in range(d + 1):
+            prefix[i + 1] = prefix[i] * (n - i) % m
+        for i in range(d, -1, -1):
+            suffix[i] = suffix[i + 1] * (n - i) % m
+        fact = [1] * (d + 1)
+        for i in range(1, d + 1):
+            fact[i] = fact[i - 1] * i % m
+        res = 0
+        for i, y in enumerate(ys):
+            term = y * prefix[i] * suffix[i + 1] * pow(fact[i] * fact[d - i], -1, m)
+            res += -term if (d - i) % 2 else term
+        return res % m
+
+    numerators, den = integer_coefficients(exp)
+    mod = m * den
+    res = 0
+    for c in reversed(numerators):
+        res = (res * n + c) % mod
+    return res // den
 
 
 if __name__ == '__main__':
@@ -3,36 +3,40 @@ Main Module
 """
 from collections import deque
 from collections.abc import Generator, Iterable, Sequence
-from math import gcd, log, prod, isqrt, isclose
+from fractions import Fraction
+from math import ceil, gcd, log, prod, isqrt, isclose
 from operator import mul
 from typing import SupportsIndex
 # LOCAL #
-from math_utils.functions._primes import decomposition
+from math_utils.functions._divisors import divisors_sorted, iter_divisors
+from math_utils.functions._poly import poly_inv, poly_mul
 
 __all__ = [
+    'berlekamp_massey',
     'divisors',
     'is_perfect_power',
     'is_perfect_square',
     'lcm',
     'linear_recurrence',
+    'linear_recurrence_chunks',
+    'linear_recurrence_nth',
 ]
 
+NAIVE_REDUCTION = 64  # up to this order, x^i mod the characteristic polynomial is reduced term by term
 
-def divisors(n: int, /, *, proper: bool = False) -> Generator[int, None, None]:
-    """ Divisors """
-    factor_dict = decomposition(n)
-    fs = list(factor_dict)
 
-    def _divisors(i: int = 0) -> Generator[int, None, None]:
-        if i == len(fs): yield 1; return
-        pows = [1]
-        for j in range(factor_dict[fs[i]]): pows.append(pows[-1] * fs[i])
-        yield from (p * q for q in _divisors(i + 1) for p in pows)
+def divisors(n: int, /, *, proper: bool = False, sort: bool = False) -> Generator[int, None, None]:
+    """
+    Divisors
 
+    >>> list(divisors(12)), list(divisors(12, proper=True, sort=True))
+    ([1, 2, 4, 3, 6, 12], [1, 2, 3, 4, 6])
+    """
+    res = divisors_sorted(n) if sort else iter_divisors(n)
     if proper:
-        yield from filter(n.__ne__, _divisors())
+        yield from filter(n.__ne__, res)
     else:
-        yield from _divisors()
+        yield from res
 
 
 def double_factorial(n: int, /) -> int:  # A006882
@@ -72,8 +76,74 @@ class lcm:
         return res
 
 
+def berlekamp_massey(sequence: Sequence[int], /, mod: int | None = None, *,
+                     confirm: int | None = None) -> list[int | Fraction]:
+    """
+    Minimal Linear Recurrence Of A Sequence (Berlekamp-Massey)
+
+    over the rationals the terms are first scaled to integers (by the lcm of their denominators, floats are read
+    exactly) and the connection polynomial is kept fraction-free (scaled by the last discrepancy and divided
+    by its content), modulo a prime mod the usual inverse of the last discrepancy is used
+
+    :param sequence: terms a_0, a_1, ...
+    :param mod: prime modulus (None: exact)
+    :param confirm: stop early once the recurrence has predicted this many consecutive terms past 2 L
+    :returns: kernel ker of length L with a_n = Σ ker[i] a_(n-1-i), so that
+              linear_recurrence(ker, sequence[:L]) reproduces the sequence
+
+    >>> berlekamp_massey([0, 1, 1, 2, 3, 5, 8, 13])
+    [1, 1]
+    >>> berlekamp_massey([1, 0, 0, 1, 0, 1, 1, 1, 2, 2, 3, 4])  # Padovan
+    [0, 1, 1]
+    >>> berlekamp_massey([Fraction(1, 2), Fraction(1, 4), Fraction(1, 8), Fraction(1, 16)])
+    [Fraction(1, 2)]
+    >>> berlekamp_massey([Fraction(1, 3), Fraction(1, 2), Fraction(7, 12), Fraction(19, 24), Fraction(47, 48)])
+    [Fraction(1, 2), 1]
+    >>> berlekamp_massey([pow(3, i, 7) for i in range(10)], 7)
+    [3]
+    """
+    sequence = [Fraction(x) for x in sequence]
+    if mod is None:
+        scale = lcm.from_iterable(x.denominator for x in sequence)  # the recurrence is invariant under scaling
+        sequence = [int(x * scale) for x in sequence]
+    else:
+        sequence = [x.numerator * pow(x.denominator, -1, mod) % mod for x in sequence]
+    c, b = [1], [1]  # connection polynomial and its copy before the last length change
+    length, shift, last, run = 0, 1, 1, 0
+    for n in range(len(sequence)):
+        d = sum(c[i] * sequence[n - i] for i in range(min(len(c), n + 1)))
+        if mod is not None: d %= mod
+        if d == 0:
+            shift += 1
+            run += 1
+            if confirm is not None and run >= confirm and n >= 2 * length: break
+            continue
+        run = 0
+        if mod is None:
+            new = [last * x for x in c] + [0] * max(0, len(b) + shift - len(c))
+            for i, x in enumerate(b):
+                new[i + shift] -= d * x
+            g = gcd(*new)
+            new = [x // g for x in new] if new[0] > 0 else [-x // g for x in new]
+        else:
+            coef = d * pow(last, -1, mod) % mod
+            new = c + [0] * max(0, len(b) + shift - len(c))
+            for i, x in enumerate(b):
+                new[i + shift] = (new[i + shift] - coef * x) % mod
+        if 2 * length <= n:
+            b, last, length, shift = c, d, n + 1 - length, 1
+        else:
+            shift += 1
+        c = new
+
+    c = (c + [0] * length)[:length + 1]
+    if mod is not None:
+        return [-x % mod for x in c[1:]]
+    return [int(f) if (f := Fraction(-x, c[0])).denominator == 1 else f for x in c[1:]]
+
+
 def linear_recurrence(ker: Sequence[int], init: Sequence[int]) -> Generator[int, None, None]:
-    # NOTE: for nth value use matrix-exponentiation method; see `big_generalized_fibonacci_numbers.py`
+    # NOTE: for the nth value use `linear_recurrence_nth`
     """
     LinearRecurrence[{a, b}, {1, 1}, 5] -> {1,1,a+b,b+a(a+b),b(a+b)+a(b+a(a+b)),...}
 
@@ -106,3 +176,173 @@ def linear_recurrence(ker: Sequence[int], init: Sequence[int]) -> Generator[int,
     while True:
         res.appendleft(sum(map(mul, ker, res)))  # dot product
         yield res[0]
+
+
+def _mat_mul(a: list[list[int]], b: list[list[int]], mod: int) -> list[list[int]]:
+    return [[sum(map(mul, row, col)) % mod for col in zip(*b)] for row in a]
+
+
+def _mat_pow(m: list[list[int]], e: int, mod: int) -> list[list[int]]:
+    res = [[int(i == j) for j in range(len(m))] for i in range(len(m))]
+    while e:
+        if e & 1: res = _mat_mul(res, m, mod)
+        m = _mat_mul(m, m, mod)
+        e >>= 1
+    return res
+
+
+def linear_recurrence_chunks(ker: Sequence[int], init: Sequence[int], /, size: int = 1 << 16, *,
+                             mod: int = 1 << 64, lanes: int | None = None, out=None) -> Generator:
+    """
+    Linear Recurrence In Blocks Of size Terms (modulo mod), filled into one buffer with NumPy
+
+    each block is split into `lanes` runs of consecutive terms whose start states come from jump-ahead
+    powers of the companion matrix, so the recurrence advances all runs at once with vectorized steps
+
+    :param size: terms per block
+    :param mod: 2^64 (wrapping uint64 arithmetic) or any modulus up to 2^32
+    :param lanes: number of parallel runs (default about sqrt(size))
+    :param out: writable buffer of size elements (NumPy array or `array('Q')`/`array('q')`), reused for every block
+    :returns: generator yielding out (a fresh uint64 array if not given) after each block
+
+    >>> from itertools import islice
+    >>> blocks = linear_recurrence_chunks([1, 1], [0, 1], 10, mod=1000)
+    >>> [list(map(int, block)) for block in islice(blocks, 2)]
+    [[0, 1, 1, 2, 3, 5, 8, 13, 21, 34], [55, 89, 144, 233, 377, 610, 987, 597, 584, 181]]
+    >>> from array import array
+    >>> buffer = array('Q', bytes(8 * 1000))
+    >>> fib = next(linear_recurrence_chunks([1, 1], [0, 1], 1000, out=buffer))[-1]
+    >>> fib == linear_recurrence_nth([1, 1], [0, 1], 999, 1 << 64) == buffer[-1]
+    True
+    """
+    import numpy as np
+
+    k = len(ker)
+    if k != len(init): raise ValueError("'ker' and 'init' must have same length")
+    if mod != 1 << 64 and not 0 < mod <= 1 << 32: raise ValueError('mod must be 2^64 or at most 2^32')
+    wrap = mod == 1 << 64
+    lanes = lanes or max(1, isqrt(size))
+    width = ceil(size / lanes)  # terms per lane
+    lanes = ceil(size / width)
+
+    if out is None:
+        out = np.empty(size, dtype=np.uint64)
+    target = out if isinstance(out, np.ndarray) else np.frombuffer(out, dtype=out.typecode)
+    grid = np.empty((lanes, width), dtype=np.uint64)
+
+    companion = [[int(j == i + 1) for j in range(k)] for i in range(k - 1)] + [[c % mod for c in reversed(ker)]]
+    jump = _mat_pow(companion, width, mod)
+    steps = [[[int(i == j) for j in range(k)] for i in range(k)]]  # jump^j for every lane j
+    for _ in range(lanes - 1):
+        steps.append(_mat_mul(jump, steps[-1], mod))
+    steps = np.array(steps, dtype=np.uint64)  # (lanes, k, k)
+    advance = _mat_pow(companion, size, mod)  # from one block to the next
+    coeffs = [np.uint64(c % mod) for c in ker]
+    m = np.uint64(0 if wrap else mod)
+
+    start = [c % mod for c in init]
+    while True:
+        state = np.array(start, dtype=np.uint64)
+        if wrap:
+            regs = [steps[:, i, :] @ state for i in range(k)]  # regs[i][j] = a_(t_j + i), t_j = start of lane j
+        else:
+            regs = []
+            for i in range(k):
+                acc = np.zeros(lanes, dtype=np.uint64)
+                for j in range(k):
+                    acc = (acc + steps[:, i, j] * state[j] % m) % m
+                regs.append(acc)
+
+        for w in range(width):
+            grid[:, w] = regs[0]
+            if wrap:
+                new = sum(c * r for c, r in zip(coeffs, reversed(regs)))
+            else:
+                new = np.zeros(lanes, dtype=np.uint64)
+                for c, r in zip(coeffs, reversed(regs)):
+                    new = (new + c * r % m) % m
+            regs = regs[1:] + [new]
+        np.copyto(target, grid.reshape(-1)[:size], casting='unsafe')
+        yield out
+        start = [sum(map(mul, row, start)) % mod for row in advance]
+
+
+def linear_recurrence_nth(ker: Sequence[int | Fraction], init: Sequence[int | Fraction], n: int, /,
+                          mod: int | None = None) -> int | Fraction:
+    """
+    n-th Term (0-indexed) Of The Linear Recurrence With Kernel ker And Initial Values init
+
+    order 2 uses fast doubling of the Lucas sequence U (U_0 = 0, U_1 = 1): a_n = U_n a_1 + q U_(n-1) a_0;
+    higher orders compute x^n mod the characteristic polynomial (Fiduccia), in O(k^2 log n) for small orders k
+    and with Kronecker products and a precomputed inverse (Barrett reduction) beyond NAIVE_REDUCTION;
+    rational ker or init (e.g. from `berlekamp_massey`) are reduced to the integer sequence e d^n a_n
+
+    >>> linear_recurrence_nth([1, 1], [0, 1], 90)  # Fibonacci
+    2880067194370816120
+    >>> linear_recurrence_nth([1, 1], [0, 1], 10 ** 18, 10 ** 9 + 7)
+    209783453
+    >>> p = 10 ** 9 + 7
+    >>> linear_recurrence_nth([2, 1], [0, 1], 10 ** 18, p) == linear_recurrence_nth([2, 1, 0], [0, 1, 2], 10 ** 18, p)
+    True
+    >>> from itertools import islice
+    >>> padovan = linear_recurrence([0, 1, 1], [1, 0, 0])
+    >>> linear_recurrence_nth([0, 1, 1], [1, 0, 0], 1000) == next(islice(padovan, 1000, None))
+    True
+    >>> linear_recurrence_nth([Fraction(1, 2), 1], [Fraction(1, 3), Fraction(1, 2)], 5)
+    Fraction(41, 32)
+    >>> ker, init = [0] * 69 + [1000], list(range(1, 71))  # a_n = 1000 a_(n-70), past NAIVE_REDUCTION
+    >>> linear_recurrence_nth(ker, init, 2000) == next(islice(linear_recurrence(ker, init), 2000, None))
+    True
+    >>> linear_recurrence_nth(ker, init, 10 ** 6, 998244353) == 51 * pow(1000, 10 ** 6 // 70, 998244353) % 998244353
+    True
+    """
+    k = len(ker)
+    if k != len(init): raise ValueError("'ker' and 'init' must have same length")
+    if n < 0: raise ValueError('n must be >= 0')
+    if not all(isinstance(x, int) for x in (*ker, *init)):  # b_n = e d^n a_n has an integer kernel and init
+        ker, init = [Fraction(c) for c in ker], [Fraction(a) for a in init]
+        d = lcm.from_iterable(c.denominator for c in ker)
+        e = lcm.from_iterable(a.denominator for a in init)
+        b = linear_recurrence_nth([int(c * d ** (i + 1)) for i, c in enumerate(ker)],
+                                  [int(a * e * d ** i) for i, a in enumerate(init)], n, mod)
+        if mod is not None: return b * pow(e * pow(d, n, mod), -1, mod) % mod
+        res = Fraction(b, e * d ** n)
+        return int(res) if res.denominator == 1 else res
+    if n < k: return init[n] if mod is None else init[n] % mod
+    if k == 1: return init[0] * ker[0] ** n if mod is None else init[0] * pow(ker[0], n, mod) % mod
+
+    if k == 2:
+        p, q = ker
+        u0, u1 = 0, 1  # U_m, U_(m+1) for m = the leading bits of n - 1
+        for bit in bin(n - 1)[2:]:
+            u0, u1 = u0 * (2 * u1 - p * u0), u1 * u1 + q * u0 * u0
+            if bit == '1': u0, u1 = u1, p * u1 + q * u0
+            if mod is not None: u0, u1 = u0 % mod, u1 % mod
+        res = u1 * init[1] + q * u0 * init[0]
+        return res if mod is None else res % mod
+
+    inv = poly_inv([1] + [-c for c in ker], k - 1, mod) if k > NAIVE_REDUCTION else None  # 1 / rev(P)
+
+    def reduce(r: list[int]) -> list[int]:
+        """ r mod P(x) = x^k - Σ ker[j] x^(k-1-j) """
+        if len(r) <= k: return r
+        if inv is None:
+            for i in range(len(r) - 1, k - 1, -1):
+                c = r.pop()
+                if c:
+                    for j, e in enumerate(ker):
+                        r[i - 1 - j] += c * e
+            return r if mod is None else [c % mod for c in r]
+        m = len(r) - k  # quotient length
+        quot = poly_mul(r[:k - 1:-1], inv[:m], mod)[:m][::-1]
+        qp = poly_mul(quot, [-c for c in reversed(ker)] + [1], mod)
+        res = [x - y for x, y in zip(r[:k], qp)]
+        return res if mod is None else [c % mod for c in res]
+
+    res = [1]
+    for bit in bin(n)[2:]:
+        res = reduce(poly_mul(res, res, mod))
+        if bit == '1': res = reduce([0] + res)
+    res = sum(c * a for c, a in zip(res, init))
+    return res if mod is None else res % mod
+
@@ -1,15 +1,35 @@
 """
 Möbius Function: https://en.wikipedia.org/wiki/M%C3%B6bius_function
 """
+from array import array
+from itertools import accumulate
 from typing import SupportsInt
 
-__all__ = ['mobius']
+# LOCAL #
+from math_utils.functions._multiplicative import lookup, mobius_table, summatory
+
+__all__ = ['mertens', 'mobius']
+
+
+def mertens(x: int, /) -> int:
+    """
+    Mertens Function: M(x) = Σ μ(n) for n <= x
+
+    uses M(v) = 1 - Σ_{d=2}^{v} M(v // d) on top of a sieved prefix table up to x^(2/3)
+
+    >>> [mertens(10 ** k) for k in range(7)]
+    [1, -1, 1, 2, -23, -48, 212]
+    """
+    if x < 1: return 0
+    lim = int(x ** (2 / 3))
+    return summatory(x, array('q', accumulate(mobius_table(lim)[:lim + 1])), lambda v: 1)
 
 
 def mobius(__x: SupportsInt) -> int:
     x = int(__x)
 
     if x < 1: raise ValueError('math domain error')
+    if (res := lookup('mobius', x)) is not None: return res
 
     primes = set()
 
@@ -0,0 +1,188 @@
+"""
+Multiplicative Functions Over Ranges
+
+A multiplicative function is fixed by its values on prime powers: f(n) = f(p1^e1) * ... * f(pk^ek).
+`multiplicative_sieve` splits every n <= N into (its smallest-prime power part) * (the rest)
+with the shared smallest-prime-factor table, so f is only evaluated on the prime powers
+and every other entry costs one multiplication (or addition, for additive functions like ω and Ω).
+
+Tables built by the presets are cached and the scalar functions (mobius, totient, div_count, div_sum)
+look their values up there whenever n is covered.
+
+`summatory` evaluates F(x) = Σ f(n) in O(x^(2/3)) whenever f * 1 (Dirichlet convolution) has a closed-form
+summatory function G, via F(v) = G(v) - Σ_{d=2}^{v} F(v // d) over the O(sqrt x) distinct values v = x // k.
+"""
+from array import array
+from collections.abc import Callable, Sequence
+
+# LOCAL #
+from math_utils.functions._sieve import spf_table
+
+__all__ = [
+    'big_omega_table',
+    'mobius_table',
+    'multiplicative_sieve',
+    'omega_table',
+    'sigma_table',
+    'tau_table',
+    'totient_table',
+]
+
+_tables: dict[str, array | list[int]] = {}
+
+
+def multiplicative_sieve(f: Callable[[int, int], int], n: int, /, *,
+                         additive: bool = False, typecode: str | None = 'q') -> array | list[int]:
+    """
+    Table Of A Multiplicative (or additive) Function
+
+    :param f: value on prime powers, f(p, e) = f(p^e)
+    :param n: upper bound (inclusive)
+    :param additive: combine coprime parts with + instead of *
+    :param typecode: array typecode of the result (None: a list of Python ints, for values that outgrow 64 bits)
+    :returns: array t of length n + 1 with t[i] = f(i) (t[0] = 0)
+
+    >>> list(multiplicative_sieve(lambda p, e: p ** e - p ** (e - 1), 12))  # totient
+    [0, 1, 1, 2, 2, 4, 2, 6, 4, 6, 4, 10, 4]
+    >>> list(multiplicative_sieve(lambda p, e: e, 12, additive=True))  # big omega
+    [0, 0, 1, 1, 2, 1, 2, 1, 3, 2, 2, 1, 3]
+    """
+    spf = spf_table(n)
+    res = [0] * (n + 1) if typecode is None else array(typecode, [0]) * (n + 1)
+    if n < 1: return res
+    res[1] = 0 if additive else 1
+    rest = array('I', [0, 1]) + array('I', [0]) * (n - 1)  # i without its smallest-prime power part
+    for i in range(2, n + 1):
+        p = spf[i]
+        m = i // p
+        r = rest[i] = rest[m] if spf[m] == p else m
+        if r == 1:
+            e = 1
+            while m > 1:
+                m //= p
+                e += 1
+            res[i] = f(p, e)
+        elif additive:
+            res[i] = res[i // r] + res[r]
+        else:
+            res[i] = res[i // r] * res[r]
+    return res
+
+
+def _cached(name: str, n: int, build: Callable[[], array | list[int]]) -> array | list[int]:
+    table = _tables.get(name)
+    if table is None or len(table) <= n:
+        table = _tables[name] = build()
+    return table
+
+
+def lookup(name: str, n: int, /) -> int | None:
+    """ :returns: the cached value of table `name` at n, or None if n is not covered """
+    table = _tables.get(name)
+    if table is not None and 0 <= n < len(table):
+        return table[n]
+    return None
+
+
+def summatory(x: int, prefix: Sequence[int], head: Callable[[int], int], /) -> int:
+    """
+    Summatory Function By The Dirichlet Hyperbola Method
+
+    :param x: upper bound
+    :param prefix: sieved prefix sums, prefix[v] = F(v) (ideally up to x^(2/3))
+    :param head: G(v), the summatory function of f * 1
+    :returns: F(x)
+    """
+    lim = len(prefix) - 1
+    if x <= lim: return prefix[x]
+    large = {}  # F(v) for v = x // k > lim
+    for k in range(x // (lim + 1), 0, -1):
+        v = x // k
+        res = head(v)
+        d = 2
+        while d <= v:
+            q = v // d
+            e = v // q  # last d with v // d == q
+            res -= (e - d + 1) * (prefix[q] if q <= lim else large[q])
+            d = e + 1
+        large[v] = res
+    return large[x]
+
+
+def mobius_table(n: int, /) -> array:
+    """
+    Möbius Function μ(i) for i <= n
+
+    >>> list(mobius_table(12))
+    [0, 1, -1, -1, 0, -1, 1, -1, 0, 0, 1, -1, 0]
+    """
+    return _cached('mobius', n, lambda: multiplicative_sieve(lambda p, e: -(e == 1), n, typecode='b'))
+
+
+def totient_table(n: int, /) -> array:
+    """
+    Euler Totient φ(i) for i <= n
+
+    >>> list(totient_table(12))
+    [0, 1, 1, 2, 2, 4, 2, 6, 4, 6, 4, 10, 4]
+    """
+    return _cached('totient', n, lambda: multiplicative_sieve(lambda p, e: p ** (e - 1) * (p - 1), n))
+
+
+def sigma_table(n: int, /, k: int = 1) -> array | list[int]:
+    """
+    Divisor Function σ_k(i) for i <= n
+
+    stored as uint64 while the bound σ_k(i) <= ζ(k) n^k (n (1 + log2 n) for k = 1) fits, else as a list
+
+    >>> list(sigma_table(12))
+    [0, 1, 3, 4, 7, 6, 12, 8, 15, 13, 18, 12, 28]
+    >>> list(sigma_table(6, k=2))
+    [0, 1, 5, 10, 21, 26, 50]
+    >>> sigma_table(100, k=10)[100] == sum(d ** 10 for d in range(1, 101) if 100 % d == 0)
+    True
+    """
+    if k == 0: return tau_table(n)
+    if k == 1:
+        bound = n * (n.bit_length() + 1)
+    else:  # ζ(k) <= 1 + 2^-k + 2^(1-k) / (k - 1)
+        bound = n ** k + (n ** k >> k) + (n ** k >> k - 1) // (k - 1) + 1
+    return _cached(f'sigma{k}', n, lambda: multiplicative_sieve(
+        lambda p, e: (p ** (k * (e + 1)) - 1) // (p ** k - 1), n, typecode='Q' if bound < 1 << 64 else None
+    ))
+
+
+def tau_table(n: int, /) -> array:
+    """
+    Number Of Divisors τ(i) for i <= n
+
+    >>> list(tau_table(12))
+    [0, 1, 2, 2, 3, 2, 4, 2, 4, 3, 4, 2, 6]
+    """
+    return _cached('tau', n, lambda: multiplicative_sieve(lambda p, e: e + 1, n, typecode='H'))
+
+
+def omega_table(n: int, /) -> array:
+    """
+    Number Of Distinct Prime Factors ω(i) for i <= n
+
+    >>> list(omega_table(12))
+    [0, 0, 1, 1, 1, 1, 2, 1, 1, 1, 2, 1, 2]
+    """
+    return _cached('omega', n, lambda: multiplicative_sieve(lambda p, e: 1, n, additive=True, typecode='B'))
+
+
+def big_omega_table(n: int, /) -> array:
+    """
+    Number Of Prime Factors With Multiplicity Ω(i) for i <= n
+
+    >>> list(big_omega_table(12))
+    [0, 0, 1, 1, 2, 1, 2, 1, 3, 2, 2, 1, 3]
+    """
+    return _cached('big_omega', n, lambda: multiplicative_sieve(lambda p, e: e, n, additive=True, typecode='B'))
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,182 @@
+"""
+Polynomial Kernels
+
+Dense polynomials are lists of integer coefficients, lowest degree first, exact or reduced modulo mod.
+Products use Kronecker substitution: both polynomials are packed into one big integer each
+(a fixed number of bytes per coefficient), so a single CPython multiplication does all the work.
+Series inverse, division, multipoint evaluation and power sums are built on top of that product;
+`factorial_table` holds the shared i! and 1/i! tables that EGF-style callers scale their coefficients with.
+"""
+# LOCAL #
+from math_utils.functions._primes import is_prime
+
+__all__ = ['factorial_table', 'multipoint_eval', 'poly_divmod', 'poly_inv', 'poly_mul', 'poly_product', 'power_sums']
+
+NAIVE = 32  # points per leaf of the remainder tree, evaluated by Horner's method
+
+_factorials_mod: dict[int, tuple[list[int], list[int]]] = {}  # prime p -> (i! mod p, 1/i! mod p)
+
+
+def factorial_table(size: int, p: int) -> tuple[list[int] | None, list[int] | None]:
+    """
+    :returns: shared tables of i! and 1/i! mod prime p for i <= size (None, None if p is not a prime > size),
+              extended in place on demand, so callers must not modify them
+
+    >>> fact, inv = factorial_table(5, 7)
+    >>> fact[:6], [f * i % 7 for f, i in zip(fact, inv)]
+    ([1, 1, 2, 6, 3, 1], [1, 1, 1, 1, 1, 1])
+    """
+    if p <= size or not is_prime(p): return None, None
+    fact, inv = _factorials_mod.get(p, ([1], [1]))
+    if len(fact) <= size:
+        start = len(fact)
+        for i in range(start, size + 1):
+            fact.append(fact[-1] * i % p)
+        inv.extend([0] * (size + 1 - start))
+        inv[size] = pow(fact[size], -1, p)
+        for i in range(size, start, -1):
+            inv[i - 1] = inv[i] * i % p
+        _factorials_mod[p] = fact, inv
+    return fact, inv
+
+
+def _pack(coeffs: list[int], width: int) -> int:
+    return int.from_bytes(b''.join(c.to_bytes(width, 'little') for c in coeffs), 'little')
+
+
+def poly_mul(a: list[int], b: list[int], mod: int | None = None) -> list[int]:
+    """
+    Product Of Two Polynomials (Kronecker substitution, signed coefficients allowed)
+
+    >>> poly_mul([1, 1], [-1, 1])
+    [-1, 0, 1]
+    >>> poly_mul([3, 4], [5, 6], 7)
+    [1, 3, 3]
+    >>> poly_mul([0, 0], [1000, 1])
+    [0, 0, 0]
+    """
+    if not a or not b: return []
+    bound = max(map(abs, a)) * max(map(abs, b)) * min(len(a), len(b))
+    if not bound: return [0] * (len(a) + len(b) - 1)
+    width = bound.bit_length() // 8 + 1  # bytes per coefficient, the top bit is spare for the sign
+    size = len(a) + len(b) - 1
+
+    def pack(coeffs: list[int]) -> int:
+        if min(coeffs) >= 0: return _pack(coeffs, width)
+        return _pack([max(c, 0) for c in coeffs], width) - _pack([max(-c, 0) for c in coeffs], width)
+
+    half = 1 << 8 * width - 1
+    product = pack(a) * pack(b)
+    if product >= 0 and min(a) >= 0 and min(b) >= 0:
+        data = product.to_bytes(size * width, 'little')
+        res = [int.from_bytes(data[i:i + width], 'little') for i in range(0, size * width, width)]
+    else:  # shift every coefficient by half, so that no slot borrows from its neighbour
+        data = (product + _pack([half] * size, width)).to_bytes(size * width, 'little')
+        res = [int.from_bytes(data[i:i + width], 'little') - half for i in range(0, size * width, width)]
+    return res if mod is None else [c % mod for c in res]
+
+
+def poly_inv(a: list[int], n: int, mod: int | None = None) -> list[int]:
+    """
+    First n Coefficients Of 1 / a (Newton iteration; exact mode needs a[0] = ±1)
+
+    >>> poly_inv([1, -1], 5)
+    [1, 1, 1, 1, 1]
+    >>> poly_inv([2, 3], 3, 7)
+    [4, 1, 2]
+    """
+    if mod is None:
+        if a[0] not in (1, -1): raise ValueError('constant term must be ±1')
+        res = [a[0]]
+    else:
+        res = [pow(a[0], -1, mod)]
+    k = 1
+    while k < n:
+        k *= 2
+        t = [-c for c in poly_mul(a[:k], res, mod)[:k]]
+        t[0] += 2
+        res = poly_mul(res, t, mod)[:k]
+    return res[:n]
+
+
+def poly_divmod(a: list[int], b: list[int], mod: int | None = None) -> tuple[list[int], list[int]]:
+    """
+    Quotient And Remainder Of a / b (exact mode needs a monic b)
+
+    >>> poly_divmod([1, 2, 3, 4], [1, 1])
+    ([3, -1, 4], [-2])
+    """
+    m = len(a) - len(b) + 1
+    if m <= 0: return [], list(a)
+    q = poly_mul(a[::-1][:m], poly_inv(b[::-1], m, mod), mod)[:m][::-1]
+    qb = poly_mul(q, b, mod)
+    r = [x - y for x, y in zip(a[:len(b) - 1], qb)]
+    return q, r if mod is None else [x % mod for x in r]
+
+
+def multipoint_eval(p: list[int], points: list[int], mod: int | None = None) -> list[int]:
+    """
+    Values Of p At All Points (remainder tree over the product tree of the x - x_i)
+
+    the tree stops at blocks of NAIVE points, which are finished by Horner's method
+
+    >>> multipoint_eval([1, 0, 1], list(range(40)))[-3:]
+    [1370, 1445, 1522]
+    """
+    blocks = [points[i:i + NAIVE] for i in range(0, len(points), NAIVE)]
+    tree = [[poly_product([[-x, 1] for x in block], mod) for block in blocks]]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([poly_mul(level[i], level[i + 1], mod) for i in range(0, len(level) - 1, 2)]
+                    + level[len(level) - 1:] * (len(level) % 2))
+
+    rems = [p]
+    for level in reversed(tree):
+        rems = [poly_divmod(rems[i // 2], m, mod)[1] for i, m in enumerate(level)]
+
+    res = []
+    for r, block in zip(rems, blocks):
+        for x in block:
+            v = 0
+            for c in reversed(r):
+                v = v * x + c
+            res.append(v if mod is None else v % mod)
+    return res
+
+
+def poly_product(polys: list[list[int]], mod: int | None = None) -> list[int]:
+    """
+    Product Of Many Polynomials (balanced product tree)
+
+    >>> poly_product([[-1, 1], [-2, 1], [-3, 1]])
+    [-6, 11, -6, 1]
+    """
+    while len(polys) > 1:
+        odd = polys[len(polys) - 1:] * (len(polys) % 2)
+        polys = [poly_mul(polys[i], polys[i + 1], mod) for i in range(0, len(polys) - 1, 2)] + odd
+    return polys[0] if polys else [1]
+
+
+def power_sums(weights: list[int], n: int, mod: int | None = None) -> list[int]:
+    """
+    Weighted Power Sums Σ_i w_i i^m for m < n, read off Σ_i w_i / (1 - i x) (fractions summed in a balanced tree)
+
+    >>> power_sums([0, 1, 1, 1], 4)
+    [3, 6, 14, 36]
+    """
+    fractions = [([w], [1, -i]) for i, w in enumerate(weights)]
+    while len(fractions) > 1:
+        merged = []
+        for (p1, q1), (p2, q2) in zip(fractions[::2], fractions[1::2]):
+            s = [x + y for x, y in zip(poly_mul(p1, q2, mod), poly_mul(p2, q1, mod))]
+            merged.append((s if mod is None else [x % mod for x in s], poly_mul(q1, q2, mod)))
+        fractions = merged + fractions[len(fractions) - 1:] * (len(fractions) % 2)
+    num, den = fractions[0]
+    if mod is not None: den = [x % mod for x in den]
+    return (poly_mul(num[:n], poly_inv(den, n, mod), mod)[:n] + [0] * n)[:n]
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
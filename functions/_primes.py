@@ -3,22 +3,42 @@ Primes
 """
 from collections import Counter
 from collections.abc import Generator
-from math import isqrt, gcd
-from random import randint
+from itertools import chain, count, repeat
+from math import gcd, isqrt, log
+from random import randrange
 
 # LOCAL #
+from math_utils.functions._sieve import SEGMENT_SIZE, iter_primes, segmented_sieve, spf_decomposition, spf_table
 from utils.supporting import SupportsBool
 
 __all__ = [
     'coprime',
     'decomposition',
     'is_prime',
+    'nth_prime',
     'prime_factors',
+    'prime_pi',
     'prime_power',
     'primes_up_to',
     'primesieve',
 ]
 
+SMALL_PRIMES = tuple(iter_primes(2, 256))  # trial division filter
+
+# (bound, k): the first k primes are a deterministic set of Miller-Rabin witnesses for all n < bound
+MR_BOUNDS = (
+    (2_047, 1),
+    (1_373_653, 2),
+    (25_326_001, 3),
+    (3_215_031_751, 4),
+    (2_152_302_898_747, 5),
+    (3_474_749_660_383, 6),
+    (341_550_071_728_321, 7),
+    (3_825_123_056_546_413_051, 9),
+    (318_665_857_834_031_151_167_461, 12),
+    (3_317_044_064_679_887_385_961_981, 13),
+)
+
 
 def coprime(a: int, b: int, /) -> bool:
     """ Co-Primality """
@@ -26,27 +46,73 @@ def coprime(a: int, b: int, /) -> bool:
 
 
 def decomposition(n: int, /) -> dict[int, int]:
-    """ Prime Decomposition """
+    """ Prime Decomposition (served from the smallest-prime-factor table when it covers n) """
+    if isinstance(n, int) and 0 <= n < len(spf_table()):
+        return spf_decomposition(n)
     return dict(Counter(prime_factors(n)))
 
 
 def is_prime(n: int, /) -> bool:
-    """ Primality """
-    if n <= 1: return False
-    if n <= 3: return True
-    if not n % 2 or not n % 3:
-        return False
-    i = 5
-    while i * i <= n:
-        if not n % i or not n % (i + 2):
-            return False
-        i += 6
-    return True
-
-
-# noinspection DuplicatedCode
+    """
+    Primality
+
+    trial division by small primes, then deterministic Miller-Rabin below 3.3e24 and BPSW above
+
+    >>> [n for n in range(30) if is_prime(n)]
+    [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    >>> is_prime(2 ** 89 - 1), is_prime(2 ** 89 + 1)
+    (True, False)
+    >>> is_prime(3_825_123_056_546_413_051)  # strong pseudoprime to the first 9 prime bases
+    False
+    """
+    if n < 2: return False
+    for p in SMALL_PRIMES:
+        if not n % p: return n == p
+    if n < SMALL_PRIMES[-1] ** 2: return True
+    return not _find_witness(n)
+
+
+def nth_prime(n: int, /) -> int:
+    """
+    Nth Prime
+
+    brackets p_n with the Rosser-Schoenfeld bounds, narrows the bracket with `prime_pi`
+    and finishes with a short segmented sieve
+
+    >>> [nth_prime(n) for n in range(1, 11)]
+    [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    >>> nth_prime(10 ** 6)
+    15485863
+    """
+    if n < 1: raise ValueError('math domain error, n must be >= 1')
+    if n < 6: return (2, 3, 5, 7, 11)[n - 1]
+    ln = log(n)
+    lo, hi = int(n * (ln + log(ln) - 1)), int(n * (ln + log(ln))) + 1  # lo < p_n <= hi
+    c = prime_pi(lo)
+    while hi - lo > 2 * SEGMENT_SIZE:
+        x = lo + int((n - c) * log(lo)) - isqrt(lo)  # interpolation, aimed slightly low
+        if x <= lo: break
+        if x >= hi: x = (lo + hi) // 2
+        if (cx := prime_pi(x)) < n:
+            lo, c = x, cx
+        else:
+            hi = x
+    for p in iter_primes(lo + 1, hi + 1):
+        c += 1
+        if c == n: return p
+
+
 def prime_factors(n: int, /, strict: bool = False) -> Generator[int, None, None]:
-    """ Prime Factors """
+    """
+    Prime Factors (in ascending order)
+
+    trial division by small primes, then Pollard-Brent rho, then Lenstra ECM for the remaining cofactors
+
+    >>> list(prime_factors(360))
+    [2, 2, 2, 3, 3, 5]
+    >>> list(prime_factors(1_000_000_016_000_000_063))  # (10^9 + 7) * (10^9 + 9)
+    [1000000007, 1000000009]
+    """
     if not isinstance(n, int):
         raise TypeError('n must be integer')
     if n < 2:
@@ -54,34 +120,232 @@ def prime_factors(n: int, /, strict: bool = False) -> Generator[int, None, None]
             raise ValueError('math domain error, n must be >= 2')
         return
 
-    while not n % 2: yield 2; n //= 2
-    while not n % 3: yield 3; n //= 3
-    i = 5
-    while i * i <= n:
-        while not n % i: yield i; n //= i
-        i += 2
-        while not n % i: yield i; n //= i
-        i += 4
-    if n > 1: yield n
+    for p in SMALL_PRIMES:
+        if p * p > n: break
+        while not n % p: yield p; n //= p
+    if n == 1: return
+    if n < SMALL_PRIMES[-1] ** 2 or is_prime(n):
+        yield n
+    else:
+        yield from sorted(_factor(n))
+
+
+def _factor(n: int, /) -> list[int]:
+    """ :returns: the prime factors of n (unordered) """
+    res = []
+    stack = [n]
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            res.append(m)
+            continue
+        r = isqrt(m)
+        d = r if r * r == m else _pollard_brent(m) or _ecm(m)
+        stack += d, m // d
+    return res
+
+
+def _pollard_brent(n: int, /, limit: int = 1 << 16, attempts: int = 3) -> int:
+    """ :returns: a non-trivial factor of composite n, or 0 if none was found within the iteration limit """
+    if not n % 2: return 2
+    for c in range(1, attempts + 1):
+        y, r, q, g = 2, 1, 1, 1
+        x = ys = y
+        while g == 1 and r <= limit:
+            x = y
+            for _ in range(r): y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(128, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += 128
+            r *= 2
+        if g == n:  # backtrack over the last batch
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if 1 < g < n: return g
+    return 0
+
+
+# (B1, curves): ECM stage 1 bounds, the last one is repeated until a factor is found
+ECM_SCHEDULE = ((2_000, 25), (11_000, 90), (50_000, 300), (250_000, 700), (1_000_000, 1_800))
+
+
+def _ecm(n: int, /) -> int:
+    """
+    Lenstra Elliptic-Curve Method on Montgomery curves (Suyama parametrization)
+
+    :returns: a non-trivial factor of composite n
+    """
+    def add(P: tuple[int, int], Q: tuple[int, int], D: tuple[int, int]) -> tuple[int, int]:  # P + Q, D = P - Q
+        u = (P[0] - P[1]) * (Q[0] + Q[1])
+        v = (P[0] + P[1]) * (Q[0] - Q[1])
+        return D[1] * (u + v) ** 2 % n, D[0] * (u - v) ** 2 % n
+
+    def double(P: tuple[int, int]) -> tuple[int, int]:
+        s, d = (P[0] + P[1]) ** 2, (P[0] - P[1]) ** 2
+        t = s - d
+        return s * d % n, t * (d + a24 * t) % n
+
+    def ladder(k: int, P: tuple[int, int]) -> tuple[int, int]:
+        R0, R1 = P, double(P)
+        for bit in bin(k)[3:]:
+            if bit == '1':
+                R0, R1 = add(R1, R0, P), double(R1)
+            else:
+                R0, R1 = double(R0), add(R0, R1, P)
+        return R0
 
+    D = 50  # stage 2 baby steps
+    for B1, curves in chain(ECM_SCHEDULE, repeat(ECM_SCHEDULE[-1])):
+        B2 = 50 * B1
+        stage1 = [p ** int(log(B1, p)) for p in iter_primes(2, B1 + 1)]
+        for _ in range(curves):
+            sigma = randrange(6, n - 6)
+            u, v = sigma * sigma - 5, 4 * sigma
+            denominator = 16 * u ** 3 * v
+            if (g := gcd(denominator, n)) != 1:
+                if g != n: return g
+                continue
+            a24 = (v - u) ** 3 * (3 * u + v) * pow(denominator, -1, n) % n
+            Q = u ** 3 % n, v ** 3 % n
 
-def _find_witness(n: int, /, k: int = 5) -> int:  # miller-rabin
+            for pe in stage1:  # stage 1: Q = [k]Q with k the product of prime powers <= B1
+                Q = ladder(pe, Q)
+            g = gcd(Q[1], n)
+            if 1 < g < n: return g
+            if g == n: continue
+
+            # stage 2 (Crandall & Pomerance, Algorithm 7.4.4): test primes q in (B1, B2] as [q]Q = O
+            S = [double(Q)]
+            S.append(double(S[0]))
+            for d in range(2, D):
+                S.append(add(S[d - 1], S[0], S[d - 2]))
+            beta = [X * Z % n for X, Z in S]
+            B = B1 - 1 if B1 % 2 == 0 else B1
+            T, R = ladder(B - 2 * D, Q), ladder(B, Q)
+            g = 1
+            primes = iter_primes(B + 2, B2 + 1)
+            q = next(primes, None)
+            for r in range(B, B2, 2 * D):
+                alpha = R[0] * R[1] % n
+                while q is not None and q <= r + 2 * D:
+                    X, Z = S[(q - r) // 2 - 1]
+                    g = g * ((R[0] - X) * (R[1] + Z) - alpha + beta[(q - r) // 2 - 1]) % n
+                    q = next(primes, None)
+                R, T = add(R, S[D - 1], T), R
+            g = gcd(g, n)
+            if 1 < g < n: return g
+
+
+def _jacobi(a: int, n: int, /) -> int:
+    """ Jacobi symbol (a/n) for odd n > 0 """
+    a %= n
+    res = 1
+    while a:
+        while not a % 2:
+            a //= 2
+            if n % 8 in (3, 5): res = -res
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3: res = -res
+        a %= n
+    return res if n == 1 else 0
+
+
+def _is_sprp(n: int, a: int, d: int, s: int, /) -> bool:
+    """ strong probable prime to base a, where n - 1 = d * 2^s with d odd """
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1: return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1: return True
+    return False
+
+
+def _is_slprp(n: int, /) -> bool:
+    """ strong Lucas probable prime (Selfridge parameters), for odd n > 2 """
+    if isqrt(n) ** 2 == n: return False
+    D = 5
+    while (j := _jacobi(D, n)) != -1:
+        if j == 0 and abs(D) != n: return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    d, s = n + 1, 0
+    while not d % 2:
+        d //= 2
+        s += 1
+
+    def half(x: int) -> int:
+        return (x + n if x % 2 else x) // 2 % n
+
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V, Qk = U * V % n, (V * V - 2 * Qk) % n, Qk * Qk % n
+        if bit == '1':
+            U, V, Qk = half(P * U + V), half(D * U + P * V), Qk * Q % n
+    if U == 0 or V == 0: return True
+    for _ in range(s - 1):
+        V, Qk = (V * V - 2 * Qk) % n, Qk * Qk % n
+        if V == 0: return True
+    return False
+
+
+def _find_witness(n: int, /) -> int:  # miller-rabin
+    """
+    :returns: a witness to the compositeness of odd n > 2,
+              or 0 if n is prime (deterministic below 3.3e24, BPSW-probable prime above)
+    """
     s = 0
     d = n - 1
     while not d % 2:
         s += 1
         d //= 2
-    for i in range(k):
-        a = randint(2, n - 1)
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1: continue
-        for r in range(1, s):
-            x = pow(x, 2, n)
-            if x == 1: return a
-            if x == n - 1: break
-        else:
-            return a
-    return 0
+    k = next((k for bound, k in MR_BOUNDS if n < bound), 1)
+    for a in SMALL_PRIMES[:k]:
+        if a % n and not _is_sprp(n, a, d, s): return a
+    if n < MR_BOUNDS[-1][0] or _is_slprp(n): return 0
+    return next(a for a in count(3) if not _is_sprp(n, a, d, s))
+
+
+def prime_pi(x: int, /) -> int:
+    """
+    Prime-Counting Function (Lucy_Hedgehog's method, O(x^(3/4)) time and O(x^(1/2)) memory)
+
+    keeps the count of survivors S(v) for every v = x // i, updating S(v) -= S(v // p) - S(p - 1) for each prime p;
+    each update is one vectorized NumPy pass, so 10^12 takes seconds and 10^13 under half a minute
+
+    >>> [prime_pi(10 ** k) for k in range(8)]
+    [0, 4, 25, 168, 1229, 9592, 78498, 664579]
+    >>> prime_pi(10 ** 10)
+    455052511
+    """
+    import numpy as np
+
+    if x < 2: return 0
+    r = isqrt(x)
+    idx = np.arange(r + 1, dtype=np.int64)
+    small = idx - 1  # small[v] = S(v)
+    small[0] = 0
+    large = np.zeros(r + 1, dtype=np.int64)  # large[i] = S(x // i)
+    large[1:] = x // idx[1:] - 1
+    for p in range(2, r + 1):
+        if small[p] == small[p - 1]: continue  # not prime
+        sp = small[p - 1]
+        p2 = p * p
+        if p2 > x: break
+        m = min(r, x // p2)
+        b = min(m, r // p)
+        large[1:b + 1] -= large[p:b * p + 1:p] - sp
+        large[b + 1:m + 1] -= small[x // p // idx[b + 1:m + 1]] - sp
+        if p2 <= r:
+            small[p2:] -= np.repeat(small[p:r // p + 1], p)[:r + 1 - p2] - sp  # small[v // p]
+    return int(large[1])
 
 
 def prime_power(n: int, /) -> tuple:
@@ -110,21 +374,31 @@ def prime_power(n: int, /) -> tuple:
         q = d
 
 
-# noinspection DuplicatedCode
-def primesieve(n: int, /) -> list[int]:
-    """ Sieve For First N Primes """
-    res = [0, 0] + [1] * (n - 1)
-    for i in range(2, isqrt(n) + 1):
-        if res[i]:
-            for j in range(i * i, n + 1, i):
-                res[j] = 0
+def primesieve(n: int, /) -> bytearray:
+    """
+    Sieve For First N Primes
+
+    :returns: table t of length n + 1 where t[i] flags the primality of i
+
+    >>> list(primesieve(10))
+    [0, 0, 1, 1, 0, 1, 0, 1, 0, 0, 0]
+    """
+    res = bytearray(n + 1)
+    if n >= 2: res[2] = 1
+    for start, segment in segmented_sieve(3, n + 1):
+        res[start:start + 2 * len(segment):2] = segment
     return res
 
 
 def primes_up_to(n: int, /, sieve: list[SupportsBool] | None = None) -> list[int]:
-    """ Primes Below N """
+    """
+    Primes Below N
+
+    >>> primes_up_to(30)
+    [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    """
     if sieve is None:
-        sieve = primesieve(n)
-    elif len(sieve) != n + 1:
+        return list(iter_primes(2, n + 1))
+    if len(sieve) != n + 1:
         raise ValueError('invalid sieve length')
     return [2] + [i for i in range(3, n + 1, 2) if sieve[i]]
@@ -1,55 +1,95 @@
 """
 Root
 """
+from collections.abc import Iterable
+from math import ceil, isqrt
 from typing import SupportsFloat, SupportsInt
 
-__all__ = ['int_sqrt', 'int_cbrt', 'floor_root', 'ceil_root']
+__all__ = ['int_sqrt', 'int_cbrt', 'floor_root', 'ceil_root', 'floor_roots', 'ceil_roots']
+
+
+def _iroot(x: int, n: int) -> int:
+    """
+    :returns: floor(x ** (1/n)) for integers x >= 0, n >= 1
+
+    the root of the top bits gives a starting point above the root with an error e <= 2^s, where s is chosen
+    so that one Newton step (which stays above the root) leaves n e^2 / 2r < 1, i.e. at most one unit correction;
+    small roots just run integer Newton from above until it stops decreasing
+    """
+    if x < 2 or n == 1: return x
+    if n == 2: return isqrt(x)
+    b = x.bit_length()
+    if b <= n: return 1
+    s = (b // n - n.bit_length() - 2) // 2  # drop s bits of the root
+    if b > 104 and s > 0:
+        r = _iroot(x >> n * s, n) + 1 << s
+        r = ((n - 1) * r + x // r ** (n - 1)) // n
+        while r ** n > x: r -= 1
+        return r
+    r = int(x ** (1 / n)) + 1 if b <= 104 else 1 << b // n + 1
+    while (y := ((n - 1) * r + x // r ** (n - 1)) // n) < r:
+        r = y
+    return r
 
 
 def floor_root(__x: SupportsFloat, __n: SupportsInt) -> int:
     """
     :returns: floored root of x
+
+    >>> floor_root(26, 3), floor_root(27, 3), floor_root(28.5, 3), floor_root(-28, 3)
+    (2, 3, 3, -4)
+    >>> floor_root(10 ** 400 + 1, 4) == 10 ** 100
+    True
     """
-    x, n = float(__x), int(__n)  # type check
+    n = int(__n)  # type check
+    if n < 0: return floor_root(1 / float(__x), -n)
 
-    if n < 0: return floor_root(1 / x, -n)
+    x = __x if isinstance(__x, int) else float(__x)
     if n % 2 and x < 0: return -ceil_root(-x, n)
     if n == 0 or x < 0: raise ValueError('math domain error')
 
-    root = -1
-    lo, hi = 0, 1 << (int(x).bit_length() + 2) // n
-    while lo <= hi:
-        mid = lo + hi >> 1
-        y = mid ** n
-        if y == x: return mid
-        if y < x:
-            lo, root = mid + 1, mid
-        else:
-            hi = mid - 1
-    return root
+    return _iroot(int(x), n)  # floor(root(x)) == floor(root(floor(x)))
 
 
 def ceil_root(__x: SupportsFloat, __n: SupportsInt) -> int:
     """
     :returns: ceiled root of x
+
+    >>> ceil_root(26, 3), ceil_root(27, 3), ceil_root(27.5, 3), ceil_root(-28, 3)
+    (3, 3, 4, -3)
+    >>> ceil_root(10 ** 400 - 1, 4) == 10 ** 100
+    True
     """
-    x, n = float(__x), int(__n)  # type check
+    n = int(__n)  # type check
+    if n < 0: return ceil_root(1 / float(__x), -n)
 
-    if n < 0: return ceil_root(1 / x, -n)
+    x = __x if isinstance(__x, int) else float(__x)
     if n % 2 and x < 0: return -floor_root(-x, n)
     if n == 0 or x < 0: raise ValueError('math domain error')
 
-    root = -1
-    lo, hi = 0, 1 << (int(x).bit_length() + 2) // n
-    while lo <= hi:
-        mid = lo + hi >> 1
-        y = mid ** n
-        if y == x: return mid
-        if y < x:
-            lo = root = mid + 1
-        else:
-            hi = mid - 1
-    return root
+    m = ceil(x)  # ceil(root(x)) == ceil(root(ceil(x)))
+    root = _iroot(m, n)
+    return root if root ** n == m else root + 1
+
+
+def floor_roots(xs: Iterable[SupportsFloat], n: SupportsInt) -> list[int]:
+    """
+    :returns: floored n-th roots of all xs
+
+    >>> floor_roots([0, 1, 7, 8, 9, 10 ** 30], 3)
+    [0, 1, 1, 2, 2, 10000000000]
+    """
+    return [floor_root(x, n) for x in xs]
+
+
+def ceil_roots(xs: Iterable[SupportsFloat], n: SupportsInt) -> list[int]:
+    """
+    :returns: ceiled n-th roots of all xs
+
+    >>> ceil_roots([0, 1, 7, 8, 9, 10 ** 30], 3)
+    [0, 1, 2, 2, 3, 10000000000]
+    """
+    return [ceil_root(x, n) for x in xs]
 
 
 def int_sqrt(__x: SupportsFloat) -> int:
@@ -59,4 +99,10 @@ def int_sqrt(__x: SupportsFloat) -> int:
 
 def int_cbrt(__x: SupportsFloat) -> int:
     """ :returns: integer part of cube root of x """
-    return ceil_root(__x, 3) if float(__x) < 0 else floor_root(__x, 3)
+    return ceil_root(__x, 3) if __x < 0 else floor_root(__x, 3)
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,138 @@
+"""
+Sieves
+
+Segmented sieve of Eratosthenes: each segment is a bytearray in which index i flags the primality of start + 2i,
+so even numbers are never stored and the working memory is bounded by the segment size.
+
+Smallest-prime-factor table: a shared array('I') with spf[i] = smallest prime factor of i, grown on demand,
+which turns the factorization of any covered n into O(log n) lookups.
+"""
+from array import array
+from collections.abc import Generator
+from itertools import compress
+from math import isqrt
+
+__all__ = ['factorize_range', 'iter_primes', 'segmented_sieve', 'spf_decomposition', 'spf_table']
+
+SEGMENT_SIZE = 1 << 18  # odd numbers per segment (one byte each, roughly the size of an L2 cache)
+
+
+def _odd_primes(n: int, /) -> list[int]:
+    """ :returns: odd primes <= n (plain odd-only sieve, used for the base primes of a segment) """
+    if n < 3: return []
+    size = (n - 1) // 2  # index i <-> 2i + 3
+    sieve = bytearray([1]) * size
+    for i in range((isqrt(n) - 1) // 2):
+        if sieve[i]:
+            p = 2 * i + 3
+            start = (p * p - 3) // 2
+            sieve[start::p] = bytes(len(range(start, size, p)))
+    return list(compress(range(3, n + 1, 2), sieve))
+
+
+def segmented_sieve(lo: int, hi: int, /, segment_size: int = SEGMENT_SIZE) -> Generator[tuple[int, bytearray], None, None]:
+    """
+    Segmented Sieve Of Eratosthenes over the odd numbers in [lo, hi)
+
+    :param lo: lower bound (inclusive)
+    :param hi: upper bound (exclusive)
+    :param segment_size: number of odd numbers sieved at once
+    :returns: pairs (start, segment) where segment[i] flags the primality of start + 2i
+
+    >>> [(start, list(seg)) for start, seg in segmented_sieve(10, 30, segment_size=4)]
+    [(11, [1, 1, 0, 1]), (19, [1, 0, 1, 0]), (27, [0, 1])]
+    """
+    if segment_size < 1: raise ValueError('segment_size must be >= 1')
+    lo = max(lo, 3) | 1
+    if lo >= hi: return
+
+    primes = _odd_primes(isqrt(hi - 1))
+    span = 2 * segment_size
+    for start in range(lo, hi, span):
+        stop = min(start + span, hi)
+        size = (stop - start + 1) // 2
+        segment = bytearray([1]) * size
+        for p in primes:
+            m = p * p
+            if m >= stop: break
+            if m < start:
+                m = start + (-start) % p
+                if not m % 2: m += p  # first odd multiple of p
+            i = (m - start) // 2
+            segment[i::p] = bytes(len(range(i, size, p)))
+        yield start, segment
+
+
+def iter_primes(lo: int, hi: int, /, segment_size: int = SEGMENT_SIZE) -> Generator[int, None, None]:
+    """
+    Primes In [lo, hi)
+
+    >>> list(iter_primes(0, 30))
+    [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    >>> list(iter_primes(1_000_000, 1_000_100))
+    [1000003, 1000033, 1000037, 1000039, 1000081, 1000099]
+    """
+    if lo <= 2 < hi: yield 2
+    for start, segment in segmented_sieve(lo, hi, segment_size):
+        yield from compress(range(start, start + 2 * len(segment), 2), segment)
+
+
+_spf = array('I')
+
+
+def spf_table(n: int = 0, /) -> array:
+    """
+    Smallest Prime Factor Table
+
+    :returns: the shared table, extended (if necessary) to cover [0, n]
+
+    >>> list(spf_table(20))[:21]
+    [0, 1, 2, 3, 2, 5, 2, 7, 2, 3, 2, 11, 2, 13, 2, 3, 2, 17, 2, 19, 2]
+    """
+    global _spf
+    if n >= len(_spf):
+        if n >= 1 << 32: raise ValueError('n must be < 2^32')
+        spf = array('I', range(n + 1))
+        for p in reversed(_odd_primes(isqrt(n))):  # descending, so that the smallest prime is written last
+            spf[p * p::2 * p] = array('I', [p]) * len(range(p * p, n + 1, 2 * p))
+        spf[4::2] = array('I', [2]) * len(range(4, n + 1, 2))
+        _spf = spf
+    return _spf
+
+
+def spf_decomposition(n: int, /) -> dict[int, int]:
+    """
+    Prime Decomposition by smallest-prime-factor lookups (n must be covered by `spf_table`)
+
+    >>> _ = spf_table(1000)
+    >>> spf_decomposition(360)
+    {2: 3, 3: 2, 5: 1}
+    """
+    spf = _spf
+    res = {}
+    while n > 1:
+        p = spf[n]
+        k = 0
+        while spf[n] == p:
+            n //= p
+            k += 1
+        res[p] = k
+    return res
+
+
+def factorize_range(lo: int, hi: int, /) -> Generator[dict[int, int], None, None]:
+    """
+    Prime Decompositions Of All n In [lo, hi)
+
+    >>> list(factorize_range(10, 15))
+    [{2: 1, 5: 1}, {11: 1}, {2: 2, 3: 1}, {13: 1}, {2: 1, 7: 1}]
+    """
+    if lo < 0: raise ValueError('lo must be >= 0')
+    spf_table(hi - 1)
+    yield from map(spf_decomposition, range(lo, hi))
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
@@ -1,20 +1,224 @@
 """
 Stirling
+
+s1(n, k) (unsigned, first kind) is read off the rising factorial x (x+1) ... (x+n-1) = Σ s1(n, k) x^k,
+whose factors are multiplied as a balanced product tree (Kronecker substitution) when working modulo m,
+s2(n, k) (second kind) comes from the explicit sum k! s2(n, k) = Σ_{i=0}^{k} (-1)^(k-i) C(k, i) i^n.
+
+Both kernels, and the diagonal / column factories, are iterative and sit behind bounded LRU caches
+(`set_stirling_cache_size`, `clear_stirling_cache`).
 """
-from functools import cache
-from math import factorial
+from collections.abc import Callable, Generator
+from functools import lru_cache
+from itertools import chain, count, islice, repeat
+from math import comb, factorial
+
+# LOCAL #
+from math_utils.functions._poly import factorial_table, poly_mul
+from math_utils.functions._primes import is_prime
+
+__all__ = [
+    'clear_stirling_cache', 's1', 's1_row', 's1_rows', 's1_triangle', 's2', 's2_rows', 's2_triangle',
+    'set_stirling_cache_size', 'stirling_column', 'stirling_diagonal', 'stirling_matrix',
+]
+
+CACHE_SIZE = 256  # rows / values / closures kept by each cached kernel
+
+
+def _rising(lo: int, hi: int, mod: int | None) -> list[int]:
+    """
+    coefficients of (x + lo) (x + lo + 1) ... (x + hi - 1)
+
+    modulo mod the factors are combined as a balanced product tree; exact coefficients grow to ~n log n bits,
+    where CPython's Karatsuba makes the big products slower than multiplying in one linear factor at a time
+    """
+    if mod is None or hi - lo <= 16:
+        res = [1]
+        for i in range(lo, hi):  # multiply by (x + i)
+            res = [i * c + d for c, d in zip(res + [0], [0] + res)]
+            if mod is not None: res = [c % mod for c in res]
+        return res
+    mid = (lo + hi) // 2
+    return poly_mul(_rising(lo, mid, mod), _rising(mid, hi, mod), mod)
+
 
-__all__ = ['s1', 's1_triangle', 's2', 's2_triangle']
+def _s1_row(n: int, mod: int | None) -> tuple[int, ...]:
+    return tuple(_rising(0, n, mod))
 
 
-@cache
-def s1(n: int, k: int) -> int:
-    """Stirling Numbers of the First Kind"""
-    # https://en.wikipedia.org/wiki/Stirling_numbers_of_the_first_kind#Recurrence_relation
+def _s2(n: int, k: int, mod: int | None) -> int:
+    if mod is not None and mod > k and is_prime(mod):
+        _, inv = factorial_table(k, mod)
+        res = sum((-1) ** (k - i) * pow(i, n, mod) * inv[i] * inv[k - i] for i in range(1, k + 1))
+        return res % mod
+
+    f = factorial(k)
+    m = None if mod is None else mod * f  # the sum is k! s2(n, k), so work modulo mod k!
+    res, c = 0, 1  # c = C(k, i)
+    for i in range(1, k + 1):
+        c = c * (k - i + 1) // i
+        term = c * (pow(i, n) if m is None else pow(i, n, m))
+        res += -term if (k - i) % 2 else term
+    if m is not None: res %= m
+    return res // f
+
+
+def set_stirling_cache_size(maxsize: int | None, /) -> None:
+    """ bounds (None: unbounded) and clears the kernel caches of s1, s2 and the diagonal / column factories """
+    global _s1_row, _s2, _eulerian2, _make_diagonal, _make_column
+    _s1_row = lru_cache(maxsize)(_s1_row.__wrapped__)
+    _s2 = lru_cache(maxsize)(_s2.__wrapped__)
+    _eulerian2 = lru_cache(maxsize)(_eulerian2.__wrapped__)
+    _make_diagonal = lru_cache(maxsize)(_make_diagonal.__wrapped__)
+    _make_column = lru_cache(maxsize)(_make_column.__wrapped__)
+
+
+def clear_stirling_cache() -> None:
+    """ empties the kernel caches of s1, s2 and the diagonal / column factories """
+    for kernel in (_s1_row, _s2, _eulerian2, _make_diagonal, _make_column):
+        kernel.cache_clear()
+
+
+_s1_row = lru_cache(CACHE_SIZE)(_s1_row)
+_s2 = lru_cache(CACHE_SIZE)(_s2)
+
+
+def s1(n: int, k: int, mod: int | None = None) -> int:
+    """
+    Stirling Numbers of the First Kind (unsigned)
+
+    >>> s1(10, 3), s1(10, 3, mod=1000)
+    (1172700, 700)
+    >>> s1(1000, 500, mod=10 ** 9 + 7) == s1(1000, 500) % (10 ** 9 + 7)
+    True
+    """
+    # https://en.wikipedia.org/wiki/Stirling_numbers_of_the_first_kind#Definitions
     if n < 0: raise ValueError('n must >= 0')
-    if n == k == 0: return 1
+    if n == k == 0: return 1 % mod if mod else 1
     if n == 0 or k <= 0 or n < k: return 0
-    return (n - 1) * s1(n - 1, k) + s1(n - 1, k - 1)
+    return _s1_row(n, mod)[k]
+
+
+def s1_row(n: int, /, mod: int | None = None) -> list[int]:
+    """
+    Row n of the unsigned Stirling Numbers of the First Kind: [s1(n, 0), ..., s1(n, n)]
+
+    >>> s1_row(5)
+    [0, 24, 50, 35, 10, 1]
+    """
+    if n < 0: raise ValueError('n must >= 0')
+    return list(_s1_row(n, mod))
+
+
+@lru_cache(CACHE_SIZE)
+def _eulerian2(d: int) -> tuple[int, ...]:
+    """ row d of the second-order Eulerian numbers <<d, j>>, j < d (A008517) """
+    row = [1]
+    for m in range(1, d + 1):
+        row = [(j + 1) * (row[j] if j < len(row) else 0) + (2 * m - 1 - j) * (row[j - 1] if j else 0) for j in range(m)]
+    return tuple(row)
+
+
+def stirling_diagonal(kind: int, d: int) -> Callable[[int], int]:
+    """
+    Stirling Diagonal: n -> s1(n+d, n) or s2(n+d, n)
+
+    both are polynomials of degree 2d in n, expanded in binomials weighted by the second-order Eulerian numbers
+    (built once per d), so every evaluation takes O(d) operations:
+
+        s1(n+d, n) = Σ_j <<d, j>> C(n+d+j, 2d)
+        s2(n+d, n) = Σ_j <<d, j>> C(n+2d-1-j, 2d)
+
+    >>> [stirling_diagonal(1, 5)(n) for n in range(6)]  # A053567
+    [0, 120, 1764, 13132, 67284, 269325]
+    >>> [stirling_diagonal(2, 5)(n) for n in range(6)]  # A112494
+    [0, 1, 63, 966, 7770, 42525]
+    >>> stirling_diagonal(2, 40)(300) == s2(340, 300)
+    True
+    >>> [stirling_diagonal(1, n)(n) for n in range(6)]  # A187646: s1(2n, n)
+    [1, 1, 11, 225, 6769, 269325]
+    >>> [stirling_diagonal(2, 2 * n)(n) for n in range(6)]  # A217913: s2(3n, n)
+    [1, 1, 31, 3025, 611501, 210766920]
+    """
+    if kind not in (1, 2): raise ValueError('kind must be 1 or 2')
+    if d < 0: raise ValueError('d must be >= 0')
+    return _make_diagonal(kind, d)
+
+
+@lru_cache(CACHE_SIZE)
+def _make_diagonal(kind: int, d: int) -> Callable[[int], int]:
+    weights = _eulerian2(d)
+    r = 2 * d
+
+    def _diagonal(n: int) -> int:
+        if n < 0: raise ValueError('n must be >= 0')
+        if d == 0: return 1
+        res = 0
+        if kind == 1:  # C(m, r) for m = n+d, n+d+1, ...
+            m = n + d
+            c = comb(m, r)
+            for w in weights:
+                res += w * c
+                m += 1
+                c = 1 if m == r else c * m // (m - r) if c else 0
+        else:  # C(m, r) for m = n+2d-1, n+2d-2, ...
+            m = n + r - 1
+            c = comb(m, r)
+            for w in weights:
+                res += w * c
+                c = c * (m - r) // m if c else 0
+                m -= 1
+        return res
+
+    return _diagonal
+
+
+def stirling_column(kind: int, k: int) -> Callable[[int], int]:
+    """
+    Stirling Column: n -> s1(n+k, k) or s2(n+k, k)
+
+    s2 columns use the fixed coefficients of s2(m, k) = Σ_i (-1)^(k-i) C(k, i) i^m / k!, O(k) powers per n;
+    s1 columns have no such closed form, so the column keeps the low k+1 coefficients of its last
+    rising factorial and extends them by one linear factor (O(k)) per step, restarting when n goes back
+
+    >>> [stirling_column(1, 4)(n) for n in range(6)]  # A000454
+    [1, 10, 85, 735, 6769, 67284]
+    >>> [stirling_column(2, 3)(n) for n in range(6)]  # A000392
+    [1, 6, 25, 90, 301, 966]
+    >>> stirling_column(1, 3)(500) == s1(503, 3)
+    True
+    >>> [stirling_column(2, n)(n * n - n) for n in range(1, 5)]  # A218141: s2(n^2, n)
+    [1, 7, 3025, 171798901]
+    """
+    if kind not in (1, 2): raise ValueError('kind must be 1 or 2')
+    if k < 0: raise ValueError('k must be >= 0')
+    return _make_column(kind, k)
+
+
+@lru_cache(CACHE_SIZE)
+def _make_column(kind: int, k: int) -> Callable[[int], int]:
+    if kind == 2:
+        f = factorial(k)
+        terms = [(i, (-1) ** (k - i) * comb(k, i)) for i in range(k + 1)]
+
+        def _column(n: int) -> int:
+            if n < 0: raise ValueError('n must be >= 0')
+            return sum(c * i ** (n + k) for i, c in terms) // f
+
+        return _column
+
+    row, top = s1_row(k), 0  # s1(k + top, 0..k)
+
+    def _column(n: int) -> int:
+        nonlocal row, top
+        if n < 0: raise ValueError('n must be >= 0')
+        if n < top: row, top = s1_row(k), 0
+        for m in range(k + top, k + n):
+            row = [m * c + d for c, d in zip(row, [0] + row)]  # multiply by (x + m), truncated
+        top = n
+        return row[k]
+
+    return _column
 
 
 # noinspection PyUnusedLocal
@@ -43,22 +247,19 @@ def s1_5th_diagonal(n: int) -> int:  # A000915
     return n * (n + 1) * (n + 2) * (n + 3) * (n + 4) * (15 * n ** 3 + 150 * n ** 2 + 485 * n + 502) // 5760
 
 
-# noinspection PyUnusedLocal
 def s1_6th_diagonal(n: int) -> int:  # A053567
     """Stirling Numbers of the First Kind: s1(n+5, n)"""
-    raise NotImplementedError
+    return stirling_diagonal(1, 5)(n)
 
 
-# noinspection PyUnusedLocal
 def s1_7th_diagonal(n: int) -> int:  # A112002
     """Stirling Numbers of the First Kind: s1(n+6, n)"""
-    raise NotImplementedError
+    return stirling_diagonal(1, 6)(n)
 
 
-# noinspection PyUnusedLocal
 def s1_8th_diagonal(n: int) -> int:  # A191685
     """Stirling Numbers of the First Kind: s1(n+7, n)"""
-    raise NotImplementedError
+    return stirling_diagonal(1, 7)(n)
 
 
 def s_1st_column(n: int) -> int:  # A000007: The characteristic function of {0}: a(n) = 0^n.
@@ -73,50 +274,42 @@ def s1_2nd_column(n: int) -> int:  # A000142: Factorial numbers
 
 def s1_3rd_column(n: int) -> int:  # A000254
     """Stirling Numbers of the First Kind: s1(n+2, 2)"""
-    # return n * s1_3rd_column(n - 1) + factorial(n - 1) if n > 0 else 0  # starts with 0
-    return (n + 1) * s1_3rd_column(n - 1) + factorial(n) if n > 0 else 1  # starts with 1
+    return stirling_column(1, 2)(n)
 
 
-# noinspection PyUnusedLocal,DuplicatedCode
 def s1_4th_column(n: int) -> int:  # A000254
     """Stirling Numbers of the First Kind: s1(n+3, 3)"""
-    raise NotImplementedError
+    return stirling_column(1, 3)(n)
 
 
-# noinspection PyUnusedLocal
 def s1_5th_column(n: int) -> int:  # A000454
     """Stirling Numbers of the First Kind: s1(n+4, 4)"""
-    raise NotImplementedError
+    return stirling_column(1, 4)(n)
 
 
-# noinspection PyUnusedLocal
 def s1_6th_column(n: int) -> int:  # A000482
     """Stirling Numbers of the First Kind: s1(n+5, 5)"""
-    raise NotImplementedError
+    return stirling_column(1, 5)(n)
 
 
-# noinspection PyUnusedLocal
 def s1_7th_column(n: int) -> int:  # A001233
     """Stirling Numbers of the First Kind: s1(n+6, 6)"""
-    raise NotImplementedError
+    return stirling_column(1, 6)(n)
 
 
-# noinspection PyUnusedLocal
 def s1_8th_column(n: int) -> int:  # A001234
     """Stirling Numbers of the First Kind: s1(n+7, 7)"""
-    raise NotImplementedError
+    return stirling_column(1, 7)(n)
 
 
-# noinspection PyUnusedLocal
 def s1_9th_column(n: int) -> int:  # A243569
     """Stirling Numbers of the First Kind: s1(n+8, 8)"""
-    raise NotImplementedError
+    return stirling_column(1, 8)(n)
 
 
-# noinspection PyUnusedLocal
 def s1_10th_column(n: int) -> int:  # A243570
     """Stirling Numbers of the First Kind: s1(n+9, 9)"""
-    raise NotImplementedError
+    return stirling_column(1, 9)(n)
 
 
 # noinspection PyUnresolvedReferences
@@ -154,23 +347,71 @@ def s1_triangle(n: int, *, signed: bool = False) -> list[list[int]]:  # A132393:
      9.  +0       +40320   -109584  +118124  -67284   +22449   -4536    +546     -36      +1
     10.  +0       -362880  +1026576 -1172700 +723680  -269325  +63273   -9450    +870     -45      +1
     """
-    sign = -1 if signed else 1
-    rows = n
-    res = [[1]]
-    for n in range(rows):
-        row = res[-1] + [0]
-        res.append([sign * n * s + row[k - 1] for k, s in enumerate(row)])
-    return res
+    return list(s1_rows(n, signed=signed))
+
+
+def s1_rows(n: int | None = None, /, *, signed: bool = False, mod: int | None = None,
+            as_numpy: bool = False) -> Generator:
+    """
+    Rows 0..n (endless for n=None) of the Stirling Numbers of the First Kind, one at a time
 
+    with as_numpy=True (requires mod < 2^31) every row is a view of one int64 buffer
+    that is updated in place, so copy it to keep it past the next step
 
-@cache
-def s2(n: int, k: int) -> int:
-    """Stirling Number of the Second Kind"""
-    # https://en.wikipedia.org/wiki/Stirling_numbers_of_the_second_kind#Recurrence_relation
+    >>> list(s1_rows(4, signed=True))[-1]
+    [0, -6, 11, -6, 1]
+    >>> for row in s1_rows(6, mod=7, as_numpy=True): pass
+    >>> row
+    array([0, 1, 1, 1, 1, 1, 1])
+    """
+    return _rows(1, n, -1 if signed else 1, mod, as_numpy)
+
+
+def _rows(kind: int, n: int | None, sign: int, mod: int | None, as_numpy: bool) -> Generator:
+    """ rows of the Stirling triangles: t(m+1, k) = t(m, k-1) + c t(m, k), c = ±m (first kind) or k (second kind) """
+    rows = range(n + 1) if n is not None else count()
+    if as_numpy:
+        import numpy as np
+
+        if mod is None or mod >= 1 << 31: raise ValueError('as_numpy requires a modulus below 2^31')
+        size = n + 2 if n is not None else 64
+        row = np.zeros(size, dtype=np.int64)
+        ks = np.arange(size, dtype=np.int64)
+        row[0] = 1 % mod
+        for m in rows:
+            yield row[:m + 1]
+            if m == n: return
+            if m + 2 > size:
+                size *= 2
+                row = np.concatenate([row, np.zeros(size - len(row), dtype=np.int64)])
+                ks = np.arange(size, dtype=np.int64)
+            c = sign * m % mod if kind == 1 else ks[1:m + 2]
+            row[1:m + 2] = (row[:m + 1] + c * row[1:m + 2]) % mod
+            row[0] = row[0] * (sign * m if kind == 1 else 0) % mod
+        return
+
+    row = [1]
+    for m in rows:
+        yield row
+        cs = repeat(sign * m) if kind == 1 else count()
+        row = [a + c * b for c, a, b in zip(cs, chain((0,), row), chain(row, (0,)))]
+        if mod is not None: row = [x % mod for x in row]
+
+
+def s2(n: int, k: int, mod: int | None = None) -> int:
+    """
+    Stirling Number of the Second Kind
+
+    >>> s2(10, 5), s2(10, 5, mod=1000)
+    (42525, 525)
+    >>> s2(3000, 1500, mod=10 ** 9 + 7) == s2(3000, 1500) % (10 ** 9 + 7)
+    True
+    """
+    # https://en.wikipedia.org/wiki/Stirling_numbers_of_the_second_kind#Explicit_formula
     if n < 0: raise ValueError('n must be a non-negative integer')
-    if n == k == 0: return 1
+    if n == k == 0: return 1 % mod if mod else 1
     if n == 0 or k <= 0 or n < k: return 0
-    return k * s2(n - 1, k) + s2(n - 1, k - 1)
+    return _s2(n, k, mod)
 
 
 def s2_3rd_diagonal(n: int) -> int:  # A001296: 4-dimensional pyramidal numbers
@@ -188,16 +429,14 @@ def s2_5th_diagonal(n: int) -> int:  # A001298
     return n * (n + 1) * (n + 2) * (n + 3) * (n + 4) * (15 * n ** 3 + 30 * n ** 2 + 5 * n - 2) // 5760
 
 
-# noinspection PyUnusedLocal
 def s2_6th_diagonal(n: int) -> int:  # A112494
     """Stirling Numbers of the Second Kind: s2(n+5, n)"""
-    raise NotImplementedError
+    return stirling_diagonal(2, 5)(n)
 
 
-# noinspection PyUnusedLocal
 def s2_7th_diagonal(n: int) -> int:  # A144969
     """Stirling Numbers of the Second Kind: s2(n+6, n)"""
-    raise NotImplementedError
+    return stirling_diagonal(2, 6)(n)
 
 
 # noinspection PyUnusedLocal
@@ -211,52 +450,44 @@ def s2_3rd_column(n: int) -> int:  # A000225: Mersenne Numbers
     return 2 ** n - 1
 
 
-# noinspection PyUnusedLocal,DuplicatedCode
 def s2_4th_column(n: int) -> int:  # A000392
     """Stirling Numbers of the Second Kind: s2(n+3, 3)"""
-    raise NotImplementedError
+    return stirling_column(2, 3)(n)
 
 
-# noinspection PyUnusedLocal
 def s2_5th_column(n: int) -> int:  # A000453
     """Stirling Numbers of the Second Kind: s2(n+4, 4)"""
-    raise NotImplementedError
+    return stirling_column(2, 4)(n)
 
 
-# noinspection PyUnusedLocal
 def s2_6th_column(n: int) -> int:  # A000481
     """Stirling Numbers of the Second Kind: s2(n+5, 5)"""
-    raise NotImplementedError
+    return stirling_column(2, 5)(n)
 
 
-# noinspection PyUnusedLocal
 def s2_7th_column(n: int) -> int:  # A000770
     """Stirling Numbers of the Second Kind: s2(n+6, 6)"""
-    raise NotImplementedError
+    return stirling_column(2, 6)(n)
 
 
-# noinspection PyUnusedLocal
 def s2_8th_column(n: int) -> int:  # A000771
     """Stirling Numbers of the Second Kind: s2(n+7, 7)"""
-    raise NotImplementedError
+    return stirling_column(2, 7)(n)
 
 
-# noinspection PyUnusedLocal
 def s2_9th_column(n: int) -> int:  # A049434
     """Stirling Numbers of the Second Kind: s2(n+8, 8)"""
-    raise NotImplementedError
+    return stirling_column(2, 8)(n)
 
 
-# noinspection PyUnusedLocal
 def s2_10th_column(n: int) -> int:  # A049447
     """Stirling Numbers of the Second Kind: s2(n+9, 9)"""
-    raise NotImplementedError
+    return stirling_column(2, 9)(n)
 
 
-# noinspection PyUnusedLocal
 def s2_11th_column(n: int) -> int:  # A049435
     """Stirling Numbers of the Second Kind: s2(n+10, 10)"""
-    raise NotImplementedError
+    return stirling_column(2, 10)(n)
 
 
 def s2_triangle(n: int) -> list[list[int]]:  # A008277: Triangle of Stirling Numbers of the Second Kind
@@ -278,16 +509,57 @@ def s2_triangle(n: int) -> list[list[int]]:  # A008277: Triangle of Stirling Num
      9.  0     1     255   3025  7770  6951  2646  462   36    1
     10.  0     1     511   9330  34105 42525 22827 5880  750   45    1
     """
-    rows = n
-    res = [[1]]
-    for n in range(rows):
-        row = res[-1] + [0]
-        res.append([k * s + row[k - 1] for k, s in enumerate(row)])
+    return list(s2_rows(n))
+
+
+def s2_rows(n: int | None = None, /, *, mod: int | None = None, as_numpy: bool = False) -> Generator:
+    """
+    Rows 0..n (endless for n=None) of the Stirling Numbers of the Second Kind, one at a time
+
+    with as_numpy=True (requires mod < 2^31) every row is a view of one int64 buffer
+    that is updated in place, so copy it to keep it past the next step
+
+    >>> list(s2_rows(4))[-1]
+    [0, 1, 7, 6, 1]
+    >>> int(next(islice(s2_rows(mod=10 ** 9 + 7, as_numpy=True), 100, None))[50]) == s2(100, 50, mod=10 ** 9 + 7)
+    True
+    """
+    return _rows(2, n, 1, mod, as_numpy)
+
+
+def stirling_matrix(n: int, /, mod: int | None = None, *, kind: int = 2, signed: bool = False):
+    """
+    Lower-Triangular (n+1) x (n+1) Matrix Of Stirling Numbers, M[i, j] = s(i, j), as a NumPy array
+
+    int64 entries modulo mod (< 2^31), Python ints (object dtype) without one;
+    the signed first kind is the inverse of the second kind, so M @ a is the Stirling transform of a sequence a
+
+    >>> import numpy as np
+    >>> s, S = stirling_matrix(6, kind=1, signed=True), stirling_matrix(6)
+    >>> bool((s @ S == np.eye(7, dtype=int)).all())
+    True
+    >>> stirling_matrix(4, 5)[4]
+    array([0, 1, 2, 1, 1])
+    """
+    import numpy as np
+
+    if kind not in (1, 2): raise ValueError('kind must be 1 or 2')
+    sign = -1 if signed else 1
+    if mod is not None and mod < 1 << 31:
+        res = np.zeros((n + 1, n + 1), dtype=np.int64)
+        for i, row in enumerate(_rows(kind, n, sign, mod, True)):
+            res[i, :i + 1] = row
+        return res
+    res = np.zeros((n + 1, n + 1), dtype=object)
+    for i, row in enumerate(_rows(kind, n, sign, mod, False)):
+        res[i, :i + 1] = row
     return res
 
 
 # More Sterling Sequences
 # -----------------------
+# s(a n, n) = stirling_diagonal(kind, (a - 1) n)(n), s2(f(n), n) = stirling_column(2, n)(f(n) - n)
+
 # A187646: s1(2n, n) - Central Stirling Numbers of the First Kind
 # A237993: s1(3n, n)
 # A242676: s1(4n, n)
@@ -3,6 +3,10 @@ Sums
 """
 from math import isqrt
 
+# LOCAL #
+from math_utils.functions._divisors import divisor_count, divisor_sum
+from math_utils.functions._multiplicative import lookup
+
 __all__ = [
     'aliquot_count',
     'aliquot_sum',
@@ -27,12 +31,14 @@ def aliquot_sum(n: int) -> int:
 
 def div_count(n: int) -> int:
     """ Count of Divisors """
-    return sum(len({k, n // k}) for k in range(1, isqrt(n) + 1) if not n % k)
+    if (res := lookup('tau', n)) is not None: return res
+    return divisor_count(n) if n else 0
 
 
 def div_sum(n: int) -> int:
     """ Sum of Divisors """
-    return sum(sum({k, n // k}) for k in range(1, isqrt(n) + 1) if not n % k)
+    if (res := lookup('sigma1', n)) is not None: return res
+    return divisor_sum(n) if n else 0
 
 
 def evens_sum(a: int, b: int) -> int:
@@ -1,9 +1,16 @@
 """
 Euler Totient Function
 """
+from array import array
+from itertools import accumulate
+
+# LOCAL #
+from math_utils.functions._multiplicative import lookup, summatory, totient_table
 
 
 def totient(n: int, /) -> int:
+    if (res := lookup('totient', n)) is not None: return res
+
     def calc(m: int, j: int, q: int) -> tuple:
         if not m % j:
             while not m % j: m //= j
@@ -22,6 +29,22 @@ def totient(n: int, /) -> int:
     return p
 
 
+def totient_summatory(x: int, /) -> int:
+    """
+    Totient Summatory Function: Φ(x) = Σ φ(n) for n <= x
+
+    uses Φ(v) = v(v + 1)/2 - Σ_{d=2}^{v} Φ(v // d) on top of a sieved prefix table up to x^(2/3)
+
+    >>> [totient_summatory(10 ** k) for k in range(7)]
+    [1, 32, 3044, 304192, 30397486, 3039650754, 303963552392]
+    """
+    if x < 1: return 0
+    lim = int(x ** (2 / 3))
+    prefix = accumulate(totient_table(lim)[:lim + 1])
+    prefix = array('Q', prefix) if lim * (lim + 1) // 2 < 1 << 64 else list(prefix)  # Φ(lim) <= lim(lim+1)/2
+    return summatory(x, prefix, lambda v: v * (v + 1) // 2)
+
+
 if __name__ == '__main__':
     import doctest
 
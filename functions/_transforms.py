@@ -0,0 +1,176 @@
+"""
+Sequence Transforms
+
+| Transform                | b_n                          | EGF                 |
+|--------------------------|------------------------------|---------------------|
+| binomial                 | Σ C(n, k) a_k                | B(x) = e^x A(x)     |
+| inverse binomial         | Σ (-1)^(n-k) C(n, k) a_k     | B(x) = e^-x A(x)    |
+| Stirling (2nd kind)      | Σ s2(n, k) a_k               | B(x) = A(e^x - 1)   |
+| inverse Stirling         | Σ (-1)^(n-k) s1(n, k) a_k    | B(x) = A(log(1+x))  |
+
+The binomial transforms are one EGF product. For the Stirling transform, A(e^x - 1) = Σ_i c_i e^(ix)
+with c_i = (1/i!) Σ_j (-1)^j a_(i+j) / j!, so b_n = Σ_i c_i i^n are power sums, summed as a rational function
+in O(n log^2 n). Its inverse recovers the c_i from those power sums (partial fractions over the known poles 1/i,
+i.e. a multipoint evaluation at 0..n) and undoes the e^-x product.
+
+Modulo a prime mod > n everything runs on factorial tables. Exact results, short sequences and any modulus
+that is not a prime above n are summed directly over the rows of the Pascal and Stirling triangles
+(reduced modulo mod as they are built): exactly, the EGF route would have to scale by n! and its
+Kronecker products end up far slower than the O(n^2) row sums.
+"""
+from collections.abc import Generator, Iterable, Sequence
+
+# LOCAL #
+from math_utils.functions._poly import factorial_table, multipoint_eval, poly_mul, poly_product, power_sums
+from math_utils.functions._primes import is_prime
+from math_utils.functions._stirling import s1_rows, s2_rows
+
+__all__ = ['binomial_transform', 'inverse_binomial_transform', 'inverse_stirling_transform', 'stirling_transform']
+
+DIRECT = 64  # shorter sequences are summed term by term
+
+
+def _correlate(w: list[int], e: list[int], mod: int | None) -> list[int]:
+    """ r_i = Σ_j w_(i+j) e_j for i < len(w) """
+    return poly_mul(w[::-1], e, mod)[:len(w)][::-1]
+
+
+def _direct(seq: Sequence[int], rows: Iterable[list[int]], mod: int | None) -> list[int]:
+    """ b_n = Σ_k t(n, k) a_k over the rows t(n, ·) of a triangle """
+    res = [sum(c * a for c, a in zip(row, seq)) for row in rows]
+    return res if mod is None else [x % mod for x in res]
+
+
+def _pascal(n: int, sign: int, mod: int | None) -> Generator[list[int], None, None]:
+    """ rows 0..n of sign^(m-k) C(m, k) """
+    row = [1]
+    for _ in range(n + 1):
+        yield row
+        row = [sign * a + b for a, b in zip(row + [0], [0] + row)]
+        if mod is not None: row = [x % mod for x in row]
+
+
+def _fast(mod: int | None, n: int) -> bool:
+    """ whether the EGF route applies: modulo a prime above n """
+    return mod is not None and mod > n and is_prime(mod)
+
+
+def binomial_transform(seq: Sequence[int], /, mod: int | None = None) -> list[int]:
+    """
+    Binomial Transform: b_n = Σ_k C(n, k) a_k
+
+    >>> binomial_transform([1, 1, 1, 1, 1])
+    [1, 2, 4, 8, 16]
+    >>> a = list(range(100))
+    >>> binomial_transform(a, 101) == [x % 101 for x in binomial_transform(a)] == [n * 2 ** n // 2 % 101 for n in a]
+    True
+    >>> binomial_transform([0] * 300) == binomial_transform([0] * 300, 998244353) == [0] * 300
+    True
+    >>> a = [k * k - 50 for k in range(200)]
+    >>> [x % 998244353 for x in binomial_transform(a)] == binomial_transform(a, 998244353)
+    True
+    """
+    return _binomial(seq, mod, 1)
+
+
+def inverse_binomial_transform(seq: Sequence[int], /, mod: int | None = None) -> list[int]:
+    """
+    Inverse Binomial Transform: b_n = Σ_k (-1)^(n-k) C(n, k) a_k
+
+    >>> inverse_binomial_transform([1, 2, 4, 8, 16])
+    [1, 1, 1, 1, 1]
+    >>> a = [k ** 3 for k in range(100)]
+    >>> inverse_binomial_transform(binomial_transform(a, 10 ** 9 + 7), 10 ** 9 + 7) == a
+    True
+    """
+    return _binomial(seq, mod, -1)
+
+
+def _binomial(seq: Sequence[int], mod: int | None, sign: int) -> list[int]:
+    n = len(seq) - 1
+    if n < DIRECT or not _fast(mod, n):
+        return _direct(seq, _pascal(n, sign, mod), mod)
+    fact, inv = factorial_table(n, mod)
+    conv = poly_mul([a * i % mod for a, i in zip(seq, inv)], [sign ** j * i % mod for j, i in enumerate(inv)], mod)
+    return [conv[m] * fact[m] % mod for m in range(n + 1)]
+
+
+def stirling_transform(seq: Sequence[int], /, mod: int | None = None, *, kind: int = 2) -> list[int]:
+    """
+    Stirling Transform: b_n = Σ_k s2(n, k) a_k (kind=2) or Σ_k s1(n, k) a_k (kind=1, unsigned)
+
+    >>> stirling_transform([1] * 10)  # A000110: Bell numbers
+    [1, 1, 2, 5, 15, 52, 203, 877, 4140, 21147]
+    >>> stirling_transform([1] * 8, kind=1)  # A000142: factorials
+    [1, 1, 2, 6, 24, 120, 720, 5040]
+    >>> from math_utils.functions import s2
+    >>> a, p = list(range(1, 101)), 10 ** 9 + 7
+    >>> stirling_transform(a, p) == [sum(s2(n, k) * x for k, x in enumerate(a[:n + 1])) % p for n in range(100)]
+    True
+    >>> stirling_transform(a, p, kind=1) == [x % p for x in stirling_transform(a, kind=1)]
+    True
+    >>> stirling_transform(a, 10 ** 9) == [x % 10 ** 9 for x in stirling_transform(a)]  # composite: direct rows
+    True
+    >>> stirling_transform([0] * 300) == [0] * 300, stirling_transform([1] + [0] * 299, p) == [1] + [0] * 299
+    (True, True)
+    """
+    if kind not in (1, 2): raise ValueError('kind must be 1 or 2')
+    if kind == 1:  # Σ s1(n, k) a_k = (-1)^n Σ (-1)^(n-k) s1(n, k) (-1)^k a_k
+        res = _inverse_stirling([(-1) ** k * a for k, a in enumerate(seq)], mod)
+        return [(-1) ** m * x if mod is None else -x % mod if m % 2 else x for m, x in enumerate(res)]
+    return _stirling(seq, mod)
+
+
+def inverse_stirling_transform(seq: Sequence[int], /, mod: int | None = None, *, kind: int = 2) -> list[int]:
+    """
+    Inverse Stirling Transform: b_n = Σ_k (-1)^(n-k) s1(n, k) a_k (kind=2) or Σ_k (-1)^(n-k) s2(n, k) a_k (kind=1)
+
+    >>> inverse_stirling_transform([1, 1, 2, 5, 15, 52, 203, 877, 4140, 21147])
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+    >>> a, p = [k * k + 1 for k in range(150)], 998244353
+    >>> inverse_stirling_transform(stirling_transform(a, p), p) == a
+    True
+    >>> inverse_stirling_transform(stirling_transform(a, p, kind=1), p, kind=1) == a
+    True
+    >>> inverse_stirling_transform([0] * 300, p) == [0] * 300
+    True
+    >>> b = stirling_transform(a)  # exact, above DIRECT
+    >>> inverse_stirling_transform(b) == a, [x % p for x in b] == stirling_transform(a, p)
+    (True, True)
+    """
+    if kind not in (1, 2): raise ValueError('kind must be 1 or 2')
+    if kind == 1:  # Σ (-1)^(n-k) s2(n, k) a_k = (-1)^n Σ s2(n, k) (-1)^k a_k
+        res = _stirling([(-1) ** k * a for k, a in enumerate(seq)], mod)
+        return [(-1) ** m * x if mod is None else -x % mod if m % 2 else x for m, x in enumerate(res)]
+    return _inverse_stirling(seq, mod)
+
+
+def _stirling(seq: Sequence[int], mod: int | None) -> list[int]:
+    """ Σ s2(n, k) a_k """
+    n = len(seq) - 1
+    if n < DIRECT or not _fast(mod, n):
+        return _direct(seq, s2_rows(n, mod=mod), mod)
+    fact, inv = factorial_table(n, mod)
+    corr = _correlate([a % mod for a in seq], [(-1) ** j * i % mod for j, i in enumerate(inv)], mod)
+    return power_sums([c * i % mod for c, i in zip(corr, inv)], n + 1, mod)
+
+
+def _inverse_stirling(seq: Sequence[int], mod: int | None) -> list[int]:
+    """ Σ (-1)^(n-k) s1(n, k) a_k """
+    n = len(seq) - 1
+    if n < DIRECT or not _fast(mod, n):
+        return _direct(seq, s1_rows(n, signed=True, mod=mod), mod)
+    # a_m = Σ_i c_i i^m, so Σ_i c_i / (1 - ix) = P(x) / Q(x) with Q = Π (1 - ix),
+    # and the reversed numerator R(y) = y^n P(1/y) has R(i) = c_i Π_(j≠i) (i - j) = c_i i! (n-i)! (-1)^(n-i)
+    q = poly_product([[1, -i % mod] for i in range(1, n + 1)], mod)
+    p = poly_mul([a % mod for a in seq], q, mod)[:n + 1]
+    r = multipoint_eval(p[::-1], list(range(n + 1)), mod)
+    fact, inv = factorial_table(n, mod)
+    w = [(-1) ** (n - m) * r[m] * inv[n - m] % mod for m in range(n + 1)]
+    return _correlate(w, inv, mod)
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
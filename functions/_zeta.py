@@ -1,16 +1,58 @@
 """
 Riemann-Zeta Function
 """
-from math import comb
+import os
+from array import array
+from collections.abc import Sequence
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from functools import cache
+from math import ceil, factorial
+from mmap import ACCESS_READ, mmap
 
-__all__ = ['zeta', 'zeta_alt', 'zeta_euler', 'zeta_euler_maclaurin', 'zeta_inf', 'zeta_knopp_hasse']
+# LOCAL #
+from math_utils.functions._bernoulli import bernoulli
+from math_utils.functions._primes import nth_prime
+from math_utils.functions._sieve import iter_primes
+
+__all__ = [
+    'primes_table', 'zeta', 'zeta_alt', 'zeta_borwein', 'zeta_decimal', 'zeta_euler', 'zeta_euler_maclaurin',
+    'zeta_inf', 'zeta_knopp_hasse',
+]
+
+PRIMES_COUNT = 1_000_000
+_primes: Sequence[int] | None = None
+
+
+def primes_table(path: str | os.PathLike | None = None) -> Sequence[int]:
+    """
+    The first PRIMES_COUNT primes, sieved on first use and cached
+
+    :param path: optional raw (native-endian) uint32 file; it is written if missing and then memory-mapped
+    """
+    global _primes
+    if _primes is not None and path is None:
+        return _primes
+    if path is not None and os.path.exists(path):
+        with open(path, 'rb') as file:
+            _primes = memoryview(mmap(file.fileno(), 0, access=ACCESS_READ)).cast('I')
+        return _primes
+    _primes = array('I', iter_primes(2, nth_prime(PRIMES_COUNT) + 1))
+    if path is not None:
+        with open(path, 'wb') as file:
+            _primes.tofile(file)
+    return _primes
+
+
+def __getattr__(name: str):
+    if name == 'PRIMES': return primes_table()  # lazy module attribute
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-with open('primes_1M.pickle', 'rb') as file:
-    PRIMES = __import__('pickle').load(file)
 
 # ITERATIONS #
 IOTA = 1_000_000
 IOTA2 = 100
+CHUNK = 4096  # rows of s per matrix-vector product in the bulk evaluation
 
 
 def zeta_inf(s: complex) -> complex:  # absolute trash
@@ -42,28 +84,116 @@ def zeta_euler(s: complex) -> complex:  # less accurate but faster
     Euler Product formula
 
     >>> zeta_euler(2)
-    1.6449340607865373
+    1.6449340607806164
     """
     res = 1
-    for p in PRIMES:
+    for p in primes_table():
         res *= 1 - p ** -s
     return 1 / abs(res)
 
 
-def zeta_knopp_hasse(s: complex) -> complex:  # accurate & fast
+@cache
+def knopp_hasse_weights(terms: int, /) -> tuple[float, ...]:
+    """
+    w_k = (-1)^k Σ_{n=k}^{terms-1} C(n, k) / 2^(n+1), so that the Knopp-Hasse series
+    reads ζ(s) = Σ_k w_k (k+1)^-s / (1 - 2^(1-s))
+
+    the sum is P(Binomial(terms, 1/2) > k) = Σ_{j>k} C(terms, j) / 2^terms, a running tail of one binomial row
+
+    >>> knopp_hasse_weights(3)
+    (0.875, -0.5, 0.125)
+    """
+    res = [0.0] * terms
+    tail, c = 0, 1  # C(terms, j) for j = terms, terms - 1, ...
+    for j in range(terms, 0, -1):
+        tail += c
+        res[j - 1] = (-1) ** (j - 1) * tail / (1 << terms)
+        c = c * j // (terms - j + 1)
+    return tuple(res)
+
+
+@cache
+def borwein_weights(terms: int, /) -> tuple[float, ...]:
+    """
+    w_k = (-1)^k (d_n - d_k) / d_n with d_k = n Σ_{i=0}^{k} (n+i-1)! 4^i / ((n-i)! (2i)!), n = terms,
+    so that Borwein's algorithm 2 reads ζ(s) = Σ_k w_k (k+1)^-s / (1 - 2^(1-s))
+    """
+    n = terms
+    d = [Fraction(0)]
+    for i in range(n + 1):
+        d.append(d[-1] + Fraction(n * factorial(n + i - 1) * 4 ** i, factorial(n - i) * factorial(2 * i)))
+    return tuple(float((-1) ** k * (d[n + 1] - d[k + 1]) / d[n + 1]) for k in range(n))
+
+
+def _alternating(s, weights: tuple[float, ...]):
+    """ :returns: Σ_k w_k (k+1)^-s / (1 - 2^(1-s)) for a scalar or (in bulk) for an array of s """
+    if isinstance(s, (int, float, complex)):
+        if s == 1:
+            return float('inf')
+        return sum(w * (k + 1) ** -s for k, w in enumerate(weights)) / (1 - 2 ** (1 - s))
+
+    import numpy as np
+
+    s = np.asarray(s)
+    flat = s.ravel()
+    res = np.empty(flat.shape, dtype=np.result_type(flat, float))
+    logs = -np.log(np.arange(1, len(weights) + 1))
+    w = np.asarray(weights)
+    for i in range(0, len(flat), CHUNK):
+        chunk = flat[i:i + CHUNK]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            res[i:i + CHUNK] = np.exp(np.multiply.outer(chunk, logs)) @ w / (1 - 2.0 ** (1 - chunk))
+    res[flat == 1] = np.inf
+    return res.reshape(s.shape)
+
+
+def _max_imag(s) -> float:
+    if isinstance(s, (int, float, complex)): return abs(complex(s).imag)
+    import numpy as np
+
+    return float(np.abs(np.imag(s)).max(initial=0))
+
+
+def zeta_knopp_hasse(s, terms: int | None = None):  # accurate & fast
     """
     # https://mathworld.wolfram.com/RiemannZetaFunction.html#eqn21
 
+    accepts a number or a NumPy array of real or complex s;
+    the series needs about IOTA2 + 1.2 |Im s| terms for full double precision, which is what terms=None picks
+    from the largest |Im s| (a fixed count is only accurate for |Im s| <= (terms - IOTA2) / 1.2)
+
     >>> zeta_knopp_hasse(2)
     1.6449340668482266
+    >>> import numpy as np
+    >>> abs(zeta_knopp_hasse(np.array([2, 4, 0.5 + 14.134725141734695j]))).round(8)
+    array([1.64493407, 1.08232323, 0.        ])
+    >>> abs(zeta_knopp_hasse(0.5 + 1000j) - zeta_borwein(0.5 + 1000j)) < 1e-12
+    True
     """
-    if s == 1:
-        return float('inf')
-    return sum(
-        1 / 2 ** (n + 1) * sum(
-            (-1) ** k * comb(n, k) * (k + 1) ** -s for k in range(n + 1)
-        ) for n in range(IOTA2)
-    ) / (1 - 2 ** (1 - s))
+    if terms is None: terms = IOTA2 + ceil(1.2 * _max_imag(s))
+    return _alternating(s, knopp_hasse_weights(terms))
+
+
+def zeta_borwein(s, terms: int | None = None):  # accurate & fastest
+    """
+    # https://en.wikipedia.org/wiki/Riemann_zeta_function#Numerical_algorithms (Borwein's algorithm 2)
+
+    accepts a number or a NumPy array of real or complex s;
+    the error bound (3 + sqrt 8)^-n exp(π |Im s| / 2) asks for n = 1.3 digits + 0.9 |Im s| terms,
+    which is what terms=None picks from the largest |Im s| (a fixed count is only accurate for
+    |Im s| <= (terms - 21) / 0.9, e.g. |Im s| <= 30 for 50 terms)
+
+    >>> zeta_borwein(2)
+    1.6449340668482264
+    >>> import numpy as np
+    >>> zeta_borwein(np.linspace(2, 4, 3))
+    array([1.64493407, 1.2020569 , 1.08232323])
+    >>> z = zeta_borwein(0.5 + 1000j)  # 921 terms
+    >>> round(z.real, 6), round(z.imag, 6)
+    (0.356334, 0.931998)
+    """
+    if terms is None: terms = 21 + ceil(0.9 * _max_imag(s))
+    return _alternating(s, borwein_weights(terms))
 
 
 zeta = zeta_knopp_hasse
@@ -124,6 +254,50 @@ def zeta_euler_maclaurin(x: float, q: float = 1) -> complex:  # scipy: most accu
     return s
 
 
+def zeta_decimal(s: int | Fraction | Decimal, prec: int = 50) -> Decimal:
+    """
+    Euler-Maclaurin Summation Formula in arbitrary precision (real s)
+
+    ζ(s) = Σ_{n<N} n^-s + N^(1-s)/(s-1) + N^-s/2 + Σ_k B_2k/(2k)! s(s+1)...(s+2k-2) N^(-s-2k+1),
+    with the Bernoulli numbers taken from the shared, incrementally extended table
+
+    :param prec: significant digits of the result
+
+    >>> from math_utils.d_constants import APERY
+    >>> zeta_decimal(3, 36) == APERY
+    True
+    >>> zeta_decimal(2, 60)
+    Decimal('1.64493406684822643647241516664602518921894990120679843773556')
+    """
+    with localcontext() as ctx:
+        ctx.prec = prec + 10
+        s = Decimal(s.numerator) / Decimal(s.denominator) if isinstance(s, Fraction) else Decimal(s)
+        if s == 1: return Decimal('Infinity')
+
+        N = 2 * prec + 10
+        res = sum(Decimal(n) ** -s for n in range(1, N))
+        power = Decimal(N) ** -s
+        res += N * power / (s - 1) + power / 2
+
+        eps = Decimal(10) ** -(prec + 5)
+        power /= N
+        rising = s  # s(s+1)...(s+2k-2)
+        factorial_ = 2
+        k = 1
+        while True:
+            b = bernoulli(2 * k)
+            term = Decimal(b.numerator) / Decimal(b.denominator * factorial_) * rising * power
+            res += term
+            if abs(term) < eps or k > N: break
+            rising *= (s + 2 * k - 1) * (s + 2 * k)
+            power /= N * N
+            factorial_ *= (2 * k + 1) * (2 * k + 2)
+            k += 1
+    with localcontext() as ctx:
+        ctx.prec = prec
+        return +res
+
+
 if __name__ == '__main__':
     import doctest
 
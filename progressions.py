@@ -1,9 +1,11 @@
 """
 Progressions
 """
-from collections import Sequence
+from collections.abc import Sequence
 from fractions import Fraction
 
+from math_utils.functions import berlekamp_massey, linear_recurrence_nth
+
 
 def guess_progression(sequence: Sequence[int]) -> str | None:
     """
@@ -11,17 +13,36 @@ def guess_progression(sequence: Sequence[int]) -> str | None:
     'Arithmetic Sequence: a1=17, d=4'
     >>> guess_progression([3, 6, 12, 24, 48])
     'Geometric Sequence: a1=3, r=2'
+    >>> guess_progression([1, 1, 2, 3, 5, 8, 13])
+    'Linear Recurrence: ker=[1, 1], init=[1, 1]'
     """
     assert len(sequence) >= 3
     d = sequence[1] - sequence[0]
     if all(b - a == d for a, b in zip(sequence[1:], sequence[2:])):
         return f'Arithmetic Sequence: a1={sequence[0]}, d={d}'
-    r = Fraction(sequence[1], sequence[0])
-    if all(Fraction(b, a) == r for a, b in zip(sequence[1:], sequence[2:])):
-        return f'Geometric Sequence: a1={sequence[0]}, r={r}'
+    if sequence[0] and all(b * sequence[0] == a * sequence[1] for a, b in zip(sequence[1:], sequence[2:])):
+        return f'Geometric Sequence: a1={sequence[0]}, r={Fraction(sequence[1], sequence[0])}'
+    ker = berlekamp_massey(sequence)
+    if 2 * len(ker) < len(sequence):  # determined by the sequence and confirmed by at least one more term
+        return f'Linear Recurrence: ker={ker}, init={list(sequence[:len(ker)])}'
     return None
 
 
+def extrapolate(sequence: Sequence[int], n: int, /, mod: int | None = None) -> int | Fraction:
+    """
+    n-th Term (0-indexed) Of The Minimal Linear Recurrence Behind sequence
+
+    >>> extrapolate([1, 1, 2, 3, 5, 8, 13], 90)
+    4660046610375530309
+    >>> extrapolate([0, 1, 2, 5, 12, 29, 70], 10 ** 18, 10 ** 9 + 7)  # Pell
+    3540480
+    >>> extrapolate([2, 3, Fraction(9, 2), Fraction(27, 4)], 10 ** 4) == 2 * Fraction(3, 2) ** 10 ** 4
+    True
+    """
+    ker = berlekamp_massey(sequence)
+    return linear_recurrence_nth(ker, sequence[:len(ker)], n, mod)
+
+
 def arithmetic_progression(mth_term: complex, difference: complex, m: int = 1):
     def _arithmetic_progression(z: complex) -> complex:
         return mth_term * difference * (z - m)